@@ -0,0 +1,300 @@
+"""
+Benchmark suite for libhomeseer against the local HomeSeer simulator.
+
+Usage: python benchmarks/bench.py [--devices 100 1000] [--latency 0.0] [--lazy]
+                                  [--save-baseline FILE] [--check FILE [--tolerance 0.5]]
+                                  [--memory-tolerance 0.1]
+
+--save-baseline writes the results to a JSON file; --check compares the results with such a file
+and exits with status 1 if any checked result is worse than the baseline by more than the tolerance
+(--memory-tolerance for memory per device, which is deterministic).
+Baselines are machine-specific; save one on the machine that runs the checks.
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+import aiohttp
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import libhomeseer  # noqa: E402
+from simulator import HomeSeerSimulator  # noqa: E402
+
+
+def percentile(samples: list, pct: float) -> float:
+    """Return the pct percentile (0-100) of samples."""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+# Results compared by --check: "name.key" -> True if higher is better
+CHECKED_RESULTS = {
+    "initialize.median_ms": False,
+    "initialize_lazy.median_ms": False,
+    "memory.bytes_per_device": False,
+    "memory_lazy.bytes_per_device": False,
+    "dc_to_callback.p50_ms": False,
+    "dc_to_callback.p95_ms": False,
+    "dc_to_callback_lazy.p50_ms": False,
+    "dc_to_callback_lazy.p95_ms": False,
+    "command_throughput.per_second": True,
+}
+
+# Results of the device count being benchmarked, as "name.key" -> value
+RESULTS = {}
+
+
+def report(name: str, **results) -> None:
+    values = ", ".join(f"{key}={value}" for key, value in results.items())
+    print(f"{name:<28} {values}")
+    for key, value in results.items():
+        RESULTS[f"{name}.{key}"] = float(value)
+
+
+def check(
+    results: dict, baseline: dict, tolerance: float, memory_tolerance: float
+) -> list:
+    """Return a description of each checked result that regressed from baseline by more than tolerance."""
+    regressions = []
+    for device_count, device_results in results.items():
+        for key, higher_is_better in CHECKED_RESULTS.items():
+            value = device_results.get(key)
+            expected = baseline.get(device_count, {}).get(key)
+            if value is None or not expected:
+                continue
+            allowed = memory_tolerance if key.startswith("memory") else tolerance
+            change = (
+                expected - value if higher_is_better else value - expected
+            ) / expected
+            status = "REGRESSION" if change > allowed else "ok"
+            print(
+                f"{device_count:>6} {key:<36} {expected:>12.2f} -> {value:>12.2f} {change:+7.1%} {status}"
+            )
+            if change > allowed:
+                regressions.append(
+                    f"{device_count} devices {key}: {expected} -> {value}"
+                )
+    return regressions
+
+
+async def bench_initialize(session, simulator, repeat: int, lazy: bool = False) -> None:
+    """Time HomeSeer.initialize() (getstatus + getcontrol + getevents and device construction)."""
+    timings = []
+    for _ in range(repeat):
+        homeseer = libhomeseer.HomeSeer(
+            "127.0.0.1",
+            session,
+            http_port=simulator.http_port,
+            ascii_port=simulator.ascii_port,
+            lazy_devices=lazy,
+        )
+        started = time.perf_counter()
+        await homeseer.initialize()
+        timings.append(time.perf_counter() - started)
+    report(
+        "initialize_lazy" if lazy else "initialize",
+        devices=len(simulator.devices),
+        median_ms=f"{statistics.median(timings) * 1000:.1f}",
+        min_ms=f"{min(timings) * 1000:.1f}",
+    )
+
+
+async def bench_memory(session, simulator, lazy: bool = False) -> None:
+    """Measure memory allocated per device by HomeSeer.initialize()."""
+    homeseer = libhomeseer.HomeSeer(
+        "127.0.0.1",
+        session,
+        http_port=simulator.http_port,
+        ascii_port=simulator.ascii_port,
+        lazy_devices=lazy,
+    )
+    gc.collect()
+    tracemalloc.start()
+    await homeseer.initialize()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    report(
+        "memory_lazy" if lazy else "memory",
+        devices=len(homeseer.devices),
+        bytes_per_device=current // max(1, len(homeseer.devices)),
+    )
+
+
+async def bench_dc_latency(
+    session, simulator, changes: int, lazy: bool = False
+) -> None:
+    """Measure latency from a DC message being sent to the device update callback being called."""
+    tracer = libhomeseer.Tracer()
+    homeseer = libhomeseer.HomeSeer(
+        "127.0.0.1",
+        session,
+        http_port=simulator.http_port,
+        ascii_port=simulator.ascii_port,
+        tracer=tracer,
+        lazy_devices=lazy,
+    )
+    await homeseer.initialize()
+    sent = {}
+    latencies = []
+    done = asyncio.Event()
+
+    def callback(ref):
+        def update():
+            if ref in sent:
+                latencies.append(time.perf_counter() - sent.pop(ref))
+                if len(latencies) == changes:
+                    done.set()
+
+        return update
+
+    for ref, device in homeseer.devices.items():
+        device.register_update_callback(callback(ref), suppress_on_connection=True)
+
+    await homeseer.start_listener()
+    refs = list(homeseer.devices)
+    for i in range(changes):
+        ref = refs[i % len(refs)]
+        sent[ref] = time.perf_counter()
+        simulator.change_device(ref, i % 2 * 255)
+        await asyncio.sleep(0.001)
+    try:
+        await asyncio.wait_for(done.wait(), 30)
+    except asyncio.TimeoutError:
+        pass
+    await homeseer.stop_listener()
+
+    if latencies:
+        report(
+            "dc_to_callback_lazy" if lazy else "dc_to_callback",
+            changes=len(latencies),
+            p50_ms=f"{percentile(latencies, 50) * 1000:.2f}",
+            p95_ms=f"{percentile(latencies, 95) * 1000:.2f}",
+            p99_ms=f"{percentile(latencies, 99) * 1000:.2f}",
+        )
+        stages = (
+            libhomeseer.STAGE_PARSED,
+            libhomeseer.STAGE_REFRESH_SENT,
+            libhomeseer.STAGE_REFRESH_RECEIVED,
+            libhomeseer.STAGE_UPDATED,
+        )
+        report(
+            "dc_stage_p50_lazy" if lazy else "dc_stage_p50",
+            **{
+                f"{stage}_ms": f"{tracer.percentiles(stage, (50,))[50] * 1000:.3f}"
+                for stage in stages
+            },
+        )
+
+
+async def bench_commands(session, simulator, commands: int, concurrency: int) -> None:
+    """Measure control_device_by_value throughput with bounded concurrency."""
+    homeseer = libhomeseer.HomeSeer(
+        "127.0.0.1",
+        session,
+        http_port=simulator.http_port,
+        ascii_port=simulator.ascii_port,
+    )
+    refs = list(simulator.devices)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def command(i):
+        async with semaphore:
+            await homeseer.control_device_by_value(refs[i % len(refs)], i % 2 * 255)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(command(i) for i in range(commands)))
+    elapsed = time.perf_counter() - started
+    report(
+        "command_throughput",
+        commands=commands,
+        concurrency=concurrency,
+        per_second=f"{commands / elapsed:.0f}",
+    )
+
+
+async def main(args) -> int:
+    results = {}
+    async with aiohttp.ClientSession() as session:
+        for device_count in args.devices:
+            print(
+                f"--- {device_count} devices, {args.latency * 1000:.0f} ms JSON latency ---"
+            )
+            simulator = HomeSeerSimulator(
+                device_count=device_count, latency=args.latency
+            )
+            await simulator.start()
+            try:
+                await bench_initialize(session, simulator, args.repeat)
+                await bench_memory(session, simulator)
+                if args.lazy:
+                    await bench_initialize(session, simulator, args.repeat, lazy=True)
+                    await bench_memory(session, simulator, lazy=True)
+                    # Registers callbacks through devices.items(), constructing every device
+                    await bench_dc_latency(session, simulator, args.changes, lazy=True)
+                await bench_dc_latency(session, simulator, args.changes)
+                await bench_commands(
+                    session, simulator, args.commands, args.concurrency
+                )
+            finally:
+                await simulator.stop()
+            results[str(device_count)] = dict(RESULTS)
+            RESULTS.clear()
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+        print(f"Saved baseline to {args.save_baseline}")
+
+    if args.check:
+        with open(args.check, encoding="utf-8") as file:
+            baseline = json.load(file)
+        print(f"--- comparing with {args.check} (tolerance {args.tolerance:.0%}) ---")
+        regressions = check(results, baseline, args.tolerance, args.memory_tolerance)
+        if regressions:
+            print(f"{len(regressions)} regression(s): " + "; ".join(regressions))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="libhomeseer benchmarks")
+    parser.add_argument("--devices", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="seconds added to each JSON response"
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--changes", type=int, default=200)
+    parser.add_argument("--commands", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument(
+        "--lazy", action="store_true", help="also benchmark lazy_devices=True"
+    )
+    parser.add_argument(
+        "--save-baseline", metavar="FILE", help="write the results to a baseline file"
+    )
+    parser.add_argument(
+        "--check", metavar="FILE", help="compare the results with a baseline file"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.5,
+        help="allowed relative regression for --check",
+    )
+    parser.add_argument(
+        "--memory-tolerance",
+        type=float,
+        default=0.1,
+        help="allowed relative regression of memory per device for --check",
+    )
+    sys.exit(asyncio.run(main(parser.parse_args())))
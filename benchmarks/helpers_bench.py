@@ -0,0 +1,124 @@
+"""
+Microbenchmark of the status and last_change helpers, and of the cached device properties
+that use them, over a corpus of HomeSeer status strings.
+
+Usage: python benchmarks/helpers_bench.py [--size 100000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from libhomeseer.devices import HomeSeerStatusDevice  # noqa: E402
+from libhomeseer.helpers import (  # noqa: E402
+    get_datetime_from_last_change,
+    get_uom_from_status,
+    get_value_from_status,
+)
+
+# Status strings as reported by HS3/HS4 for common Z-Wave and virtual devices
+STATUS_TEMPLATES = (
+    "On",
+    "Off",
+    "Dim {pct}%",
+    "Locked",
+    "Unlocked",
+    "Open",
+    "Closed",
+    "Motion",
+    "No Motion",
+    "Idle",
+    "Heating",
+    "Cooling",
+    "Auto",
+    "Battery {pct}%",
+    "{temp} C",
+    "{temp} F",
+    "{pct}%",
+    "{lux} Lux",
+    "{watts} W",
+    "{watts} Watts",
+    "{kw} kW",
+    "{kwh} kW Hours",
+    "{volts} V",
+    "{volts} Volts",
+    "{amps} A",
+    "{amps} Amperes",
+)
+
+
+def build_corpus(size: int) -> list:
+    """Return size random (status, last_change) pairs."""
+    corpus = []
+    for _ in range(size):
+        status = random.choice(STATUS_TEMPLATES).format(
+            pct=random.randint(0, 100),
+            temp=round(random.uniform(-10, 35), 1),
+            lux=random.randint(0, 2000),
+            watts=round(random.uniform(0, 3000), 2),
+            kw=round(random.uniform(0, 10), 3),
+            kwh=round(random.uniform(0, 50000), 2),
+            volts=round(random.uniform(110, 240), 1),
+            amps=round(random.uniform(0, 30), 2),
+        )
+        if random.random() < 0.05:
+            last_change = "/Date(-62135596800000)/"
+        else:
+            last_change = f"/Date({random.randint(1500000000000, 1700000000000)}-0500)/"
+        corpus.append((status, last_change))
+    return corpus
+
+
+def report(name: str, seconds: float, size: int) -> None:
+    print(f"{name:<40} {seconds / size * 1e9:8.0f} ns/op")
+
+
+def main(args) -> None:
+    corpus = build_corpus(args.size)
+    statuses = [status for status, _ in corpus]
+    last_changes = [last_change for _, last_change in corpus]
+    devices = [
+        HomeSeerStatusDevice(
+            {"ref": ref, "status": status, "last_change": last_change}, None
+        )
+        for ref, (status, last_change) in enumerate(corpus)
+    ]
+
+    for name, func, data in (
+        ("get_uom_from_status", get_uom_from_status, statuses),
+        ("get_value_from_status", get_value_from_status, statuses),
+        ("get_datetime_from_last_change", get_datetime_from_last_change, last_changes),
+    ):
+        seconds = min(
+            timeit.repeat(
+                lambda: [func(item) for item in data], number=1, repeat=args.repeat
+            )
+        )
+        report(name, seconds, args.size)
+
+    # The first read after an update parses; subsequent reads are served from the cache
+    for prop in ("uom", "status_value", "last_change_datetime"):
+        getter = getattr(HomeSeerStatusDevice, prop).fget
+        for device in devices:
+            device._parsed = {}
+        first = timeit.timeit(lambda: [getter(device) for device in devices], number=1)
+        cached = min(
+            timeit.repeat(
+                lambda: [getter(device) for device in devices],
+                number=1,
+                repeat=args.repeat,
+            )
+        )
+        report(f"device.{prop} (first read)", first, args.size)
+        report(f"device.{prop} (cached)", cached, args.size)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="libhomeseer helper microbenchmark")
+    parser.add_argument("--size", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    main(parser.parse_args())
@@ -0,0 +1,307 @@
+"""
+Local HomeSeer simulator for benchmarking libhomeseer without a live HomeSeer installation.
+Serves the JSON API (getstatus, getcontrol, getevents, controldevicebyvalue, runevent)
+and the ASCII interface (au, vr, and DC device change messages).
+
+Run standalone with: python benchmarks/simulator.py --devices 500 --change-rate 5
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import time
+
+from aiohttp import web
+
+DEVICE_KINDS = (
+    "Z-Wave Switch Binary",
+    "Z-Wave Switch Multilevel",
+    "Z-Wave Door Lock",
+    "Z-Wave Temperature",
+    "Z-Wave Electric Meter",
+    "Z-Wave Watts",
+)
+LOCATIONS = ("Kitchen", "Living Room", "Bedroom", "Garage", "Office", "Basement")
+LOCATIONS2 = ("Main Floor", "Upstairs", "Downstairs")
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _last_change() -> str:
+    return f"/Date({int(time.time() * 1000)}-0500)/"
+
+
+def _status(kind: str, value) -> str:
+    """Return a HomeSeer-like status string for a device value."""
+    if kind == "Z-Wave Switch Binary":
+        return "On" if value else "Off"
+    if kind == "Z-Wave Switch Multilevel":
+        return "Off" if value == 0 else ("On" if value >= 99 else f"Dim {value}%")
+    if kind == "Z-Wave Door Lock":
+        return "Locked" if value == 255 else "Unlocked"
+    if kind == "Z-Wave Temperature":
+        return f"{value} C"
+    if kind == "Z-Wave Electric Meter":
+        return f"{value} kW Hours"
+    return f"{value} Watts"
+
+
+def _control_pairs(kind: str) -> list:
+    """Return HomeSeer-like control pairs for a device kind."""
+    if kind == "Z-Wave Switch Binary":
+        return [
+            {"ControlUse": 1, "Label": "On", "ControlValue": 255},
+            {"ControlUse": 2, "Label": "Off", "ControlValue": 0},
+        ]
+    if kind == "Z-Wave Switch Multilevel":
+        return [
+            {"ControlUse": 1, "Label": "On", "ControlValue": 99},
+            {"ControlUse": 2, "Label": "Off", "ControlValue": 0},
+            {"ControlUse": 3, "Label": "Dim (value)%", "ControlValue": 0},
+        ]
+    if kind == "Z-Wave Door Lock":
+        return [
+            {"ControlUse": 18, "Label": "Lock", "ControlValue": 255},
+            {"ControlUse": 19, "Label": "Unlock", "ControlValue": 0},
+        ]
+    return []
+
+
+def _random_value(kind: str):
+    if kind == "Z-Wave Switch Binary":
+        return random.choice((0, 255))
+    if kind == "Z-Wave Switch Multilevel":
+        return random.randint(0, 99)
+    if kind == "Z-Wave Door Lock":
+        return random.choice((0, 255))
+    if kind == "Z-Wave Temperature":
+        return round(random.uniform(15, 30), 1)
+    return round(random.uniform(0, 2000), 2)
+
+
+class HomeSeerSimulator:
+    """
+    Simulated HomeSeer installation.
+    Devices are grouped in fours: a root device followed by three child devices.
+    latency is added to every JSON response; change_rate random device changes per second
+    are broadcast as DC messages to connected ASCII clients.
+    """
+
+    def __init__(
+        self,
+        device_count: int = 100,
+        event_count: int = 20,
+        latency: float = 0.0,
+        change_rate: float = 0.0,
+        username: str = "default",
+        password: str = "default",
+    ) -> None:
+        self.latency = latency
+        self.change_rate = change_rate
+        self.username = username
+        self.password = password
+        self.http_port = None
+        self.ascii_port = None
+        self.request_count = 0
+        self.devices = {}
+        self.kinds = {}
+        self.events = [
+            {"Group": f"Group {i % 5}", "Name": f"Event {i}", "id": i}
+            for i in range(event_count)
+        ]
+        self._clients = set()
+        self._runner = None
+        self._ascii_server = None
+        self._change_task = None
+        for ref in range(1, device_count + 1):
+            self._add_device(ref)
+
+    def _add_device(self, ref: int) -> None:
+        kind = DEVICE_KINDS[ref % len(DEVICE_KINDS)]
+        root = ref - (ref - 1) % 4
+        if ref == root:
+            relationship = 2
+            associated = [r for r in range(ref + 1, ref + 4)]
+        else:
+            relationship = 4
+            associated = [root]
+        value = _random_value(kind)
+        self.kinds[ref] = kind
+        self.devices[ref] = {
+            "ref": ref,
+            "name": f"Device {ref}",
+            "location": LOCATIONS[(root // 4) % len(LOCATIONS)],
+            "location2": LOCATIONS2[(root // 4) % len(LOCATIONS2)],
+            "value": value,
+            "status": _status(kind, value),
+            "device_type_string": kind,
+            "last_change": _last_change(),
+            "relationship": relationship,
+            "associated_devices": associated,
+            "interface_name": "Z-Wave",
+        }
+
+    async def start(
+        self, host: str = "127.0.0.1", http_port: int = 0, ascii_port: int = 0
+    ) -> None:
+        """Start the JSON and ASCII servers (port 0 picks a free port)."""
+        app = web.Application()
+        app.router.add_route("*", "/JSON", self._handle_json)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, http_port)
+        await site.start()
+        self.http_port = self._runner.addresses[0][1]
+
+        self._ascii_server = await asyncio.start_server(
+            self._handle_ascii, host, ascii_port
+        )
+        self.ascii_port = self._ascii_server.sockets[0].getsockname()[1]
+
+        if self.change_rate > 0:
+            self._change_task = asyncio.get_event_loop().create_task(
+                self._random_changes()
+            )
+
+    async def stop(self) -> None:
+        """Stop the servers and disconnect ASCII clients."""
+        if self._change_task is not None:
+            self._change_task.cancel()
+        for writer in list(self._clients):
+            writer.close()
+        if self._ascii_server is not None:
+            self._ascii_server.close()
+            await self._ascii_server.wait_closed()
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    def change_device(self, ref: int, value) -> None:
+        """Change the value of a device and broadcast a DC message."""
+        raw = self.devices[ref]
+        old_value = raw["value"]
+        raw["value"] = value
+        raw["status"] = _status(self.kinds[ref], value)
+        raw["last_change"] = _last_change()
+        self.broadcast(f"DC,{ref},{value},{old_value}")
+
+    def broadcast(self, line: str) -> None:
+        """Write a line to all connected (logged in) ASCII clients."""
+        data = f"{line}\r\n".encode()
+        for writer in self._clients:
+            writer.write(data)
+
+    async def _random_changes(self) -> None:
+        refs = list(self.devices)
+        while True:
+            await asyncio.sleep(random.expovariate(self.change_rate))
+            ref = random.choice(refs)
+            self.change_device(ref, _random_value(self.kinds[ref]))
+
+    async def _handle_json(self, request: web.Request) -> web.Response:
+        self.request_count += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        if request.method == "POST":
+            body = await request.json()
+            if body.get("action") == "runevent":
+                for event in self.events:
+                    if event["Group"] == body.get("group") and event[
+                        "Name"
+                    ] == body.get("name"):
+                        return web.json_response({"Response": "ok"})
+                return web.json_response({"Response": "error, event not found"})
+            return web.json_response({"Response": "error"})
+
+        params = request.query
+        action = params.get("request")
+        if action == "getstatus":
+            if "ref" in params:
+                refs = [int(ref) for ref in params["ref"].split(",") if ref]
+                devices = [self.devices[ref] for ref in refs if ref in self.devices]
+            else:
+                devices = list(self.devices.values())
+            return web.json_response({"Name": "HomeSeer Devices", "Devices": devices})
+        if action == "getcontrol":
+            return web.json_response(
+                {
+                    "Name": "HomeSeer Devices",
+                    "Devices": [
+                        {"ref": ref, "ControlPairs": _control_pairs(kind)}
+                        for ref, kind in self.kinds.items()
+                    ],
+                }
+            )
+        if action == "getevents":
+            return web.json_response({"Name": "HomeSeer Events", "Events": self.events})
+        if action == "controldevicebyvalue":
+            ref = int(params["ref"])
+            value = float(params["value"])
+            value = int(value) if value.is_integer() else value
+            if ref in self.devices:
+                self.change_device(ref, value)
+                return web.json_response({"Devices": [self.devices[ref]]})
+            return web.json_response({"Response": "error, device not found"})
+        return web.json_response({"Response": "error, unknown request"})
+
+    async def _handle_ascii(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                command = line.decode().strip().split(",")
+                if command[0] == "au":
+                    if command[1:3] == [self.username, self.password]:
+                        writer.write(b"ok\r\n")
+                        self._clients.add(writer)
+                    else:
+                        writer.write(b"error, invalid login\r\n")
+                elif command[0] == "vr":
+                    writer.write(b"HomeSeer Simulator 4.0.0.0\r\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self._clients.discard(writer)
+            writer.close()
+
+
+async def main(args) -> None:
+    simulator = HomeSeerSimulator(
+        device_count=args.devices,
+        event_count=args.events,
+        latency=args.latency,
+        change_rate=args.change_rate,
+    )
+    await simulator.start(args.host, args.http_port, args.ascii_port)
+    print(
+        f"HomeSeer simulator with {args.devices} devices listening on "
+        f"http://{args.host}:{simulator.http_port}/JSON and ASCII port {simulator.ascii_port}"
+    )
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local HomeSeer simulator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--http-port", type=int, default=8080)
+    parser.add_argument("--ascii-port", type=int, default=11000)
+    parser.add_argument("--devices", type=int, default=100)
+    parser.add_argument("--events", type=int, default=20)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="seconds added to each JSON response"
+    )
+    parser.add_argument(
+        "--change-rate",
+        type=float,
+        default=0.0,
+        help="random device changes per second",
+    )
+    try:
+        asyncio.run(main(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -4,6 +4,38 @@ from .devices import (
     HomeSeerSwitchableDevice,
     HomeSeerDimmableDevice,
     HomeSeerLockableDevice,
+    LazyDeviceMapping,
 )
 from .helpers import *
+from .history import DeviceHistory
 from .homeseer import HomeSeer
+from .index import (
+    INDEX_DEVICE_TYPE_STRING,
+    INDEX_INTERFACE_NAME,
+    INDEX_LOCATION,
+    INDEX_LOCATION2,
+    INDEX_RELATIONSHIP,
+)
+from .messages import (
+    MESSAGE_DEVICE_CHANGE,
+    MESSAGE_EVENT,
+    MESSAGE_LOG,
+    MESSAGE_STRING_CHANGE,
+    HomeSeerASCIIMessage,
+    HomeSeerDeviceChangeMessage,
+    HomeSeerEventMessage,
+    HomeSeerLogMessage,
+    HomeSeerStringChangeMessage,
+)
+from .metrics import Metrics
+from .tracing import (
+    STAGE_PARSED,
+    STAGE_RECEIVED,
+    STAGE_REFRESH_RECEIVED,
+    STAGE_REFRESH_SENT,
+    STAGE_UPDATED,
+    Trace,
+    Tracer,
+)
+from .recorder import ChangeRecorder, read_change_chunks, read_changes
+from .throttle import ThrottlePolicy
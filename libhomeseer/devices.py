@@ -1,9 +1,16 @@
 """Representations of API data for HomeSeer devices as Python objects."""
 
+from collections.abc import Mapping
 import logging
-from typing import Callable, Optional, Union
+from datetime import datetime
+from typing import Callable, Iterator, Optional, Union
 
 from .const import RELATIONSHIP_CHILD, RELATIONSHIP_ROOT, RELATIONSHIP_STANDALONE
+from .helpers import (
+    get_datetime_from_last_change,
+    get_uom_from_status,
+    get_value_from_status,
+)
 
 CONTROL_USE_ON = 1
 CONTROL_USE_OFF = 2
@@ -36,6 +43,8 @@ class HomeSeerStatusDevice:
         self._request = request
         self._update_callback = None
         self._suppress_update_callback = False
+        # Values parsed from self._raw_data, computed on first access after each update
+        self._parsed = {}
 
     @property
     def ref(self) -> int:
@@ -69,6 +78,24 @@ class HomeSeerStatusDevice:
         """Return the status of the device."""
         return self._raw_data["status"]
 
+    @property
+    def status_value(self) -> Optional[Union[int, float]]:
+        """Return the number parsed from the status of the device (e.g. 21.5 from "21.5 C"), or None."""
+        try:
+            return self._parsed["status_value"]
+        except KeyError:
+            value = self._parsed["status_value"] = get_value_from_status(self.status)
+            return value
+
+    @property
+    def uom(self) -> Optional[str]:
+        """Return the unit of measure parsed from the status of the device, or None if no unit can be parsed."""
+        try:
+            return self._parsed["uom"]
+        except KeyError:
+            uom = self._parsed["uom"] = get_uom_from_status(self.status)
+            return uom
+
     @property
     def device_type_string(self) -> Optional[str]:
         """Return the device type string of the device, or None for no type string (e.g. virtual device)."""
@@ -81,6 +108,17 @@ class HomeSeerStatusDevice:
         """Return the last change of the device."""
         return self._raw_data["last_change"]
 
+    @property
+    def last_change_datetime(self) -> Optional[datetime]:
+        """Return the last change of the device as a datetime, or None if no datetime can be parsed."""
+        try:
+            return self._parsed["last_change_datetime"]
+        except KeyError:
+            dt = self._parsed["last_change_datetime"] = get_datetime_from_last_change(
+                self.last_change
+            )
+            return dt
+
     @property
     def relationship(self) -> int:
         """
@@ -134,6 +172,7 @@ class HomeSeerStatusDevice:
                 f"Updating data for {self.location2} {self.location} {self.name} ({self.ref})"
             )
             self._raw_data = new_data
+            self._parsed = {}
 
         if connection_flag and self._suppress_update_callback:
             return
@@ -340,3 +379,111 @@ def get_device(
             f"CONTROL: ({control_pairs})."
         )
         return HomeSeerStatusDevice(raw_data, request)
+
+
+# Raw data fields with few distinct values, stored once by LazyDeviceMapping
+_SHARED_FIELDS = frozenset(
+    ("location", "location2", "device_type_string", "interface_name")
+)
+
+
+class LazyDeviceMapping(Mapping):
+    """
+    Mapping of device ref to device object that constructs each device object (with get_device)
+    on first access. Until then, the raw data of the device is kept in a compact store:
+    a tuple of values sharing one tuple of keys with all devices that have the same keys,
+    with location, type and interface strings shared between devices, and control pairs reduced
+    to (ControlUse, Label, ControlValue) tuples.
+    Iterating, len() and "in" do not construct device objects; values() and items() construct all of them.
+    """
+
+    def __init__(self, request: Callable) -> None:
+        self._request = request
+        self._devices = {}
+        self._raw = {}
+        self._controls = {}
+        self._key_tuples = {}
+        self._strings = {}
+
+    def __getitem__(self, ref: int):
+        device = self._devices.get(ref)
+        if device is None:
+            raw_data = self.get_raw(ref)
+            if raw_data is None:
+                raise KeyError(ref)
+            control_pairs = self._controls.pop(ref, None)
+            control_data = (
+                [
+                    {
+                        "ref": raw_data["ref"],
+                        "ControlPairs": [
+                            {"ControlUse": use, "Label": label, "ControlValue": value}
+                            for use, label, value in control_pairs
+                        ],
+                    }
+                ]
+                if control_pairs is not None
+                else []
+            )
+            device = get_device(raw_data, control_data, self._request)
+            del self._raw[ref]
+            self._devices[ref] = device
+        return device
+
+    def __iter__(self) -> Iterator[int]:
+        # Iterate over a snapshot of the refs: values() and items() construct devices,
+        # which moves them from self._raw to self._devices while iterating
+        return iter([*self._devices, *self._raw])
+
+    def __len__(self) -> int:
+        return len(self._devices) + len(self._raw)
+
+    def __contains__(self, ref) -> bool:
+        return ref in self._devices or ref in self._raw
+
+    def add(self, raw_data: dict, control_pairs: Optional[list] = None) -> None:
+        """Store the raw data and control pairs of a device, replacing any existing device."""
+        ref = int(raw_data["ref"])
+        self._devices.pop(ref, None)
+        self._store(ref, raw_data)
+        if control_pairs is not None:
+            self._controls[ref] = tuple(
+                (pair["ControlUse"], pair["Label"], pair["ControlValue"])
+                for pair in control_pairs
+            )
+        else:
+            self._controls.pop(ref, None)
+
+    def is_loaded(self, ref: int) -> bool:
+        """Return True if the device object for ref has been constructed."""
+        return ref in self._devices
+
+    def loaded(self) -> list:
+        """Return the device objects that have been constructed."""
+        return list(self._devices.values())
+
+    def get_raw(self, ref: int) -> Optional[dict]:
+        """Return the stored raw data of a device whose object has not been constructed, or None."""
+        stored = self._raw.get(ref)
+        if stored is None:
+            return None
+        return dict(zip(*stored))
+
+    def set_raw(self, ref: int, raw_data: dict) -> None:
+        """Replace the stored raw data of a device whose object has not been constructed."""
+        if ref in self._raw:
+            self._store(ref, raw_data)
+
+    def _store(self, ref: int, raw_data: dict) -> None:
+        keys = tuple(raw_data)
+        keys = self._key_tuples.setdefault(keys, keys)
+        strings = self._strings
+        self._raw[ref] = (
+            keys,
+            tuple(
+                strings.setdefault(value, value)
+                if key in _SHARED_FIELDS and isinstance(value, str)
+                else value
+                for key, value in raw_data.items()
+            ),
+        )
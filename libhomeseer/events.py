@@ -1,6 +1,6 @@
 """Representation of API data for HomeSeer events as Python objects."""
 
-from typing import Callable
+from typing import Callable, Optional
 
 
 class HomeSeerEvent:
@@ -20,7 +20,16 @@ class HomeSeerEvent:
         """Return the name of the event."""
         return self._raw_data["Name"]
 
-    async def run(self) -> None:
-        """Run the event."""
+    @property
+    def key(self) -> tuple:
+        """Return the (group, name) pair that identifies the event."""
+        return self._raw_data["Group"], self._raw_data["Name"]
+
+    def update_data(self, new_data: dict) -> None:
+        """Cache updated data for the event from the HomeSeer JSON API."""
+        self._raw_data = new_data
+
+    async def run(self) -> Optional[dict]:
+        """Run the event and return the response from the HomeSeer JSON API (None on error)."""
         json = {"action": "runevent", "group": self.group, "name": self.name}
-        await self._request("post", json=json)
+        return await self._request("post", json=json)
@@ -1,9 +1,10 @@
 """Helper functions."""
 
 import logging
+import re
 from datetime import datetime, timezone
 from string import digits
-from typing import Optional
+from typing import Optional, Union
 
 HS_UNIT_A = "A"
 HS_UNIT_AMPERES = "Amperes"
@@ -20,6 +21,8 @@ HS_UNIT_WATTS = "Watts"
 
 HS_NULL_DATE = "-62135596800000"
 
+_STATUS_NUMBER = re.compile(r"-?\d+(?:\.\d+)?")
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -72,3 +75,14 @@ def get_uom_from_status(status: str) -> Optional[str]:
     elif HS_UNIT_W in status:
         uom = HS_UNIT_W
     return uom
+
+
+def get_value_from_status(status: str) -> Optional[Union[int, float]]:
+    """Parses a status to return its first number (e.g. 21.5 from "21.5 C"), or None if it contains no number."""
+    match = _STATUS_NUMBER.search(status)
+    if match is None:
+        return None
+    number = match.group()
+    if "." in number:
+        return float(number)
+    return int(number)
@@ -0,0 +1,186 @@
+"""Fixed-size value history of HomeSeer devices, stored in array-backed ring buffers."""
+
+from array import array
+from bisect import bisect_left
+from heapq import merge
+from itertools import repeat
+import logging
+from operator import itemgetter
+from time import time
+from typing import Iterable, Optional
+
+HISTORY_MAX_SAMPLES = 100000
+HISTORY_SAMPLES_PER_DEVICE = 1000
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class DeviceHistory:
+    """
+    Ring buffer of the most recent (timestamp, value) samples of a device.
+    Timestamps are UNIX timestamps in seconds. Samples are stored in two arrays of C doubles
+    (16 bytes per sample), and aggregates are computed over array slices with builtin functions.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self._capacity = capacity
+        self._timestamps = array("d", bytes(8 * capacity))
+        self._values = array("d", bytes(8 * capacity))
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def capacity(self) -> int:
+        """Return the maximum number of samples kept."""
+        return self._capacity
+
+    def append(self, timestamp: float, value: float) -> None:
+        """Add a sample, overwriting the oldest sample if the buffer is full."""
+        self._timestamps[self._next] = timestamp
+        self._values[self._next] = value
+        self._next = (self._next + 1) % self._capacity
+        if self._count < self._capacity:
+            self._count += 1
+
+    def merge(self, samples: Iterable[tuple]) -> int:
+        """
+        Merge (timestamp, value) samples into the history in time order, e.g. to backfill from a change log.
+        Samples at a timestamp already in the history are skipped, and the oldest samples are dropped
+        beyond the capacity. Returns the number of merged samples kept.
+        """
+        timestamps, values = self._window(None)
+        existing = set(timestamps)
+        added = sorted(
+            (
+                (timestamp, value, True)
+                for timestamp, value in samples
+                if timestamp not in existing
+            ),
+            key=itemgetter(0),
+        )
+        if not added:
+            return 0
+        merged = list(
+            merge(zip(timestamps, values, repeat(False)), added, key=itemgetter(0))
+        )[-self._capacity :]
+
+        count = len(merged)
+        self._timestamps[:count] = array("d", (sample[0] for sample in merged))
+        self._values[:count] = array("d", (sample[1] for sample in merged))
+        self._count = count
+        self._next = count % self._capacity
+        return sum(sample[2] for sample in merged)
+
+    def latest(self) -> Optional[tuple]:
+        """Return the most recent (timestamp, value) sample, or None if there are no samples."""
+        if not self._count:
+            return None
+        last = self._next - 1
+        return self._timestamps[last], self._values[last]
+
+    def samples(self, window: Optional[float] = None) -> list:
+        """Return the (timestamp, value) samples of the last window seconds (or all samples), oldest first."""
+        timestamps, values = self._window(window)
+        return list(zip(timestamps, values))
+
+    def min(self, window: Optional[float] = None) -> Optional[float]:
+        """Return the minimum value of the last window seconds (or all samples), or None if there are no samples."""
+        _, values = self._window(window)
+        return min(values) if values else None
+
+    def max(self, window: Optional[float] = None) -> Optional[float]:
+        """Return the maximum value of the last window seconds (or all samples), or None if there are no samples."""
+        _, values = self._window(window)
+        return max(values) if values else None
+
+    def mean(self, window: Optional[float] = None) -> Optional[float]:
+        """Return the mean value of the last window seconds (or all samples), or None if there are no samples."""
+        _, values = self._window(window)
+        return sum(values) / len(values) if values else None
+
+    def rate(self, window: Optional[float] = None) -> Optional[float]:
+        """
+        Return the rate of change per second between the first and last samples of the last window seconds
+        (or all samples), e.g. kW from a kW Hours meter multiplied by 3600; None if fewer than two samples.
+        """
+        timestamps, values = self._window(window)
+        if len(values) < 2 or timestamps[-1] == timestamps[0]:
+            return None
+        return (values[-1] - values[0]) / (timestamps[-1] - timestamps[0])
+
+    def _window(self, window: Optional[float]) -> tuple:
+        """Return chronological (timestamps, values) arrays for the last window seconds."""
+        if self._count < self._capacity:
+            timestamps = self._timestamps[: self._count]
+            values = self._values[: self._count]
+        else:
+            timestamps = self._timestamps[self._next :] + self._timestamps[: self._next]
+            values = self._values[self._next :] + self._values[: self._next]
+
+        if window is not None:
+            start = bisect_left(timestamps, time() - window)
+            if start:
+                timestamps = timestamps[start:]
+                values = values[start:]
+        return timestamps, values
+
+
+class HistoryStore:
+    """
+    History of many devices with bounded total memory:
+    at most max_samples samples are allocated across all tracked devices.
+    """
+
+    def __init__(
+        self,
+        samples_per_device: int = HISTORY_SAMPLES_PER_DEVICE,
+        max_samples: int = HISTORY_MAX_SAMPLES,
+    ) -> None:
+        self._samples_per_device = samples_per_device
+        self._max_samples = max_samples
+        self._allocated = 0
+        self._histories = {}
+
+    def __contains__(self, ref: int) -> bool:
+        return ref in self._histories
+
+    def __getitem__(self, ref: int) -> DeviceHistory:
+        return self._histories[ref]
+
+    def get(self, ref: int) -> Optional[DeviceHistory]:
+        """Return the history of a device, or None if the device is not tracked."""
+        return self._histories.get(ref)
+
+    def track(self, refs: Iterable[int]) -> None:
+        """
+        Allocate histories for devices. The capacity of each history is samples_per_device,
+        reduced as necessary so that the total stays within max_samples; devices that do not fit are not tracked.
+        """
+        refs = [ref for ref in refs if ref not in self._histories]
+        if not refs:
+            return
+        available = self._max_samples - self._allocated
+        capacity = min(self._samples_per_device, available // len(refs))
+        if capacity < 2:
+            _LOGGER.warning(
+                f"History sample budget ({self._max_samples}) exhausted; not tracking {len(refs)} devices"
+            )
+            return
+        for ref in refs:
+            self._histories[ref] = DeviceHistory(capacity)
+        self._allocated += capacity * len(refs)
+
+    def untrack(self, ref: int) -> None:
+        """Stop tracking a device and release its history."""
+        history = self._histories.pop(ref, None)
+        if history is not None:
+            self._allocated -= history.capacity
+
+    def record(self, ref: int, value: float, timestamp: Optional[float] = None) -> None:
+        """Add a sample for a tracked device (timestamp defaults to now); ignored for untracked devices."""
+        history = self._histories.get(ref)
+        if history is not None:
+            history.append(time() if timestamp is None else timestamp, value)
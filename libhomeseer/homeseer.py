@@ -4,8 +4,12 @@ Sends commands via JSON API and listens for device changes via ASCII interface.
 """
 
 from aiohttp import BasicAuth, ClientSession, ContentTypeError
+import asyncio
 from asyncio import TimeoutError
+from collections import deque
 import logging
+from time import perf_counter, time
+from typing import Callable, Iterable, Optional, Union
 
 from .const import (
     DEFAULT_ASCII_PORT,
@@ -13,9 +17,46 @@ from .const import (
     DEFAULT_PASSWORD,
     DEFAULT_USERNAME,
 )
-from .devices import get_device
+from .devices import LazyDeviceMapping, get_device
 from .events import HomeSeerEvent
-from .listener import Listener
+from .history import (
+    HISTORY_MAX_SAMPLES,
+    HISTORY_SAMPLES_PER_DEVICE,
+    DeviceHistory,
+    HistoryStore,
+)
+from .index import DeviceIndex
+from .listener import (
+    PING_TIMEOUT,
+    PING_TIMER,
+    RECONNECT_MAX_TIMER,
+    RECONNECT_TIMER,
+    Listener,
+)
+from .messages import HomeSeerASCIIMessage, HomeSeerDeviceChangeMessage
+from .metrics import Metrics
+from .poller import (
+    POLL_FAST_TIMER,
+    POLL_REQUESTS_PER_SECOND,
+    POLL_SLOW_TIMER,
+    Poller,
+)
+from .recorder import (
+    RECORDER_BATCH_SIZE,
+    RECORDER_FLUSH_TIMER,
+    ChangeRecorder,
+    read_change_chunks,
+)
+from .throttle import Throttle, ThrottlePolicy
+from .tracing import (
+    STAGE_REFRESH_RECEIVED,
+    STAGE_REFRESH_SENT,
+    STAGE_UPDATED,
+    Trace,
+    Tracer,
+)
+
+EVENT_CONCURRENCY = 4
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -31,6 +72,14 @@ class HomeSeer:
         password: str = DEFAULT_PASSWORD,
         http_port: int = DEFAULT_HTTP_PORT,
         ascii_port: int = DEFAULT_ASCII_PORT,
+        ping_interval: float = PING_TIMER,
+        ping_timeout: float = PING_TIMEOUT,
+        reconnect_timer: float = RECONNECT_TIMER,
+        reconnect_max_timer: float = RECONNECT_MAX_TIMER,
+        tcp_keepalive: bool = True,
+        metrics: Optional[Metrics] = None,
+        tracer: Optional[Tracer] = None,
+        lazy_devices: bool = False,
     ) -> None:
         self._host = host
         self._websession = websession
@@ -41,13 +90,52 @@ class HomeSeer:
             username=username,
             password=password,
             ascii_port=ascii_port,
+            ping_interval=ping_interval,
+            ping_timeout=ping_timeout,
+            reconnect_timer=reconnect_timer,
+            reconnect_max_timer=reconnect_max_timer,
+            tcp_keepalive=tcp_keepalive,
+            metrics=metrics,
+            tracer=tracer,
             async_message_callback=self._message_callback,
             async_connect_callback=self._connect_callback,
             async_disconnect_callback=self._disconnect_callback,
         )
         self._available = False
-        self._devices = {}
+        self._lazy = lazy_devices
+        self._devices = LazyDeviceMapping(self._request) if lazy_devices else {}
+        self._index = DeviceIndex()
+        self._history = None
+        self._throttle = Throttle()
+        self._deferred_refreshes = {}
+        self._recorder = None
         self._events = []
+        self._event_index = {}
+        self._message_callbacks = {}
+        self._pending_changes = None
+        self._poller = None
+        self._poll_priority_refs = set()
+        self._metrics = metrics
+        self._tracer = tracer
+        if metrics is not None:
+            self._request_duration = metrics.histogram(
+                "request_duration_seconds", "Duration of HomeSeer JSON API requests."
+            )
+            self._request_errors = metrics.counter(
+                "request_errors", "HomeSeer JSON API requests that failed."
+            )
+            self._update_duration = metrics.histogram(
+                "device_update_duration_seconds",
+                "Duration of device updates, including update callbacks.",
+            )
+            self._throttled_changes = metrics.counter(
+                "throttled_device_changes",
+                "Device Change messages not refreshed because of a throttle policy.",
+            )
+            self._pending_changes_depth = metrics.gauge(
+                "pending_device_changes",
+                "Device Change messages buffered while devices are refreshed.",
+            )
 
     @property
     def available(self) -> bool:
@@ -55,8 +143,21 @@ class HomeSeer:
         return self._available
 
     @property
-    def devices(self) -> dict:
-        """Return a dict of initialized supported devices indexed by device_ref for the HomeSeer instance."""
+    def reconnect_count(self) -> int:
+        """Return the number of ASCII reconnection attempts made by self._listener."""
+        return self._listener.reconnect_count
+
+    @property
+    def detection_latency(self) -> Optional[float]:
+        """Return the seconds taken by self._listener to detect the most recent dead ASCII connection."""
+        return self._listener.detection_latency
+
+    @property
+    def devices(self) -> Union[dict, LazyDeviceMapping]:
+        """
+        Return a dict of initialized supported devices indexed by device_ref for the HomeSeer instance.
+        With lazy_devices, a LazyDeviceMapping that constructs each device object on first access.
+        """
         return self._devices
 
     @property
@@ -64,11 +165,212 @@ class HomeSeer:
         """Return a list of initialized events for the HomeSeer instance."""
         return self._events
 
+    def get_devices(
+        self,
+        location: Optional[str] = None,
+        location2: Optional[str] = None,
+        device_type_string: Optional[str] = None,
+        interface_name: Optional[str] = None,
+        relationship: Optional[int] = None,
+    ) -> list:
+        """
+        Return a list of devices (ordered by ref) matching all of the given parameters,
+        e.g. get_devices(location="Kitchen", device_type_string=DEVICE_ZWAVE_SWITCH_MULTILEVEL).
+        Parameters left as None are not used to filter; use "" to match an empty location.
+        """
+        criteria = {
+            field: value
+            for field, value in (
+                ("location", location),
+                ("location2", location2),
+                ("device_type_string", device_type_string),
+                ("interface_name", interface_name),
+                ("relationship", relationship),
+            )
+            if value is not None
+        }
+        return [self._devices[ref] for ref in sorted(self._index.query(**criteria))]
+
+    def get_child_devices(self, ref: int) -> list:
+        """Return a list of the child devices (ordered by ref) of a root device."""
+        children = self._index.children(ref) or ()
+        return [
+            self._devices[child] for child in sorted(children) if child in self._devices
+        ]
+
+    def get_locations(self, field: str = "location") -> set:
+        """Return the distinct values of location (or location2, with field="location2") of all devices."""
+        return self._index.values(field)
+
+    def enable_history(
+        self,
+        refs: Optional[Iterable[int]] = None,
+        samples_per_device: int = HISTORY_SAMPLES_PER_DEVICE,
+        max_samples: int = HISTORY_MAX_SAMPLES,
+    ) -> None:
+        """
+        Keep a history of the most recent value changes of devices in refs (or all devices),
+        with at most samples_per_device samples per device and max_samples samples in total.
+        Calling again adds devices to the history with the original limits.
+        """
+        if self._history is None:
+            self._history = HistoryStore(
+                samples_per_device=samples_per_device, max_samples=max_samples
+            )
+        refs = list(self.devices if refs is None else refs)
+        self._history.track(refs)
+        for ref in refs:
+            raw_data = self._get_raw_data(ref)
+            if raw_data is not None and ref in self._history:
+                self._history.record(ref, raw_data["value"])
+
+    def disable_history(self) -> None:
+        """Stop keeping device history and release it."""
+        self._history = None
+
+    def get_history(self, ref: int) -> Optional[DeviceHistory]:
+        """Return the value history of a device, or None if history is not kept for the device."""
+        if self._history is None:
+            return None
+        return self._history.get(ref)
+
+    async def start_recording(
+        self,
+        path: str,
+        batch_size: int = RECORDER_BATCH_SIZE,
+        flush_interval: float = RECORDER_FLUSH_TIMER,
+    ) -> None:
+        """
+        Append every device change (ref, timestamp, value, status) to the file at path,
+        one compact JSON array per line. Changes are written in batches by the default executor.
+        """
+        await self.stop_recording()
+        recorder = ChangeRecorder(
+            path, batch_size=batch_size, flush_interval=flush_interval
+        )
+        await recorder.start()
+        self._recorder = recorder
+
+    async def stop_recording(self) -> None:
+        """Stop recording device changes, writing any buffered changes."""
+        if self._recorder is not None:
+            recorder, self._recorder = self._recorder, None
+            await recorder.stop()
+
+    async def backfill_history(self, path: str, until: Optional[float] = None) -> int:
+        """
+        Add the device changes recorded in the file at path (up to the UNIX timestamp until, if given)
+        to the history of tracked devices, in time order with the recorded timestamps.
+        Device data, update callbacks and the recorder are not touched. Returns the number of samples added.
+        The log is read in chunks, keeping at most the capacity of each history in memory.
+        """
+        if self._history is None:
+            return 0
+        samples = {}
+        async for changes in read_change_chunks(path, until):
+            for ref, timestamp, value, _ in changes:
+                ref_samples = samples.get(ref)
+                if ref_samples is None:
+                    history = self._history.get(ref)
+                    if history is None:
+                        continue
+                    # Only the newest samples up to the capacity can be kept
+                    ref_samples = samples[ref] = deque(maxlen=history.capacity)
+                ref_samples.append((timestamp, value))
+        return sum(
+            self._history[ref].merge(ref_samples)
+            for ref, ref_samples in samples.items()
+        )
+
+    async def replay_changes(self, path: str, until: Optional[float] = None) -> int:
+        """
+        Apply the device changes recorded in the file at path (up to the UNIX timestamp until, if given)
+        as the current device data, in log order, calling update callbacks, e.g. to test an application
+        with a recorded session. Replayed changes are not added to the history or the recorder
+        (use backfill_history to fill the history). Returns the number of changes applied.
+        The log is read and applied in chunks.
+        """
+        applied = 0
+        async for changes in read_change_chunks(path, until):
+            for ref, timestamp, value, status in changes:
+                raw_data = self._get_raw_data(ref)
+                if raw_data is None:
+                    continue
+                new_data = dict(raw_data)
+                new_data.update(
+                    value=value,
+                    status=status,
+                    last_change=f"/Date({int(timestamp * 1000)})/",
+                )
+                self._apply_device_data(ref, new_data, record_changes=False)
+                applied += 1
+        return applied
+
+    def set_throttle_policy(
+        self,
+        policy: Optional[ThrottlePolicy],
+        ref: Optional[int] = None,
+        device_type_string: Optional[str] = None,
+    ) -> None:
+        """
+        Throttle the refreshes triggered by Device Change messages for a device ref or for all devices
+        with a device_type_string (e.g. DEVICE_ZWAVE_WATTS); a ref policy takes precedence.
+        Set policy to None to remove a policy.
+        """
+        self._throttle.set_policy(
+            policy, ref=ref, device_type_string=device_type_string
+        )
+
+    def get_event(self, group: str, name: str) -> Optional[HomeSeerEvent]:
+        """Return the event with group and name, or None if there is no such event."""
+        return self._event_index.get((group, name))
+
     async def initialize(self) -> None:
         """"Retrieve devices and events from the HomeSeer instance."""
         await self._get_devices()
         await self._get_events()
 
+    async def refresh_events(self) -> None:
+        """
+        Refresh events from the HomeSeer instance. Existing event objects are updated in place,
+        new events are appended to HomeSeer.events and deleted events are removed from it.
+        """
+        await self._get_events()
+
+    async def run_event(self, group: str, name: str) -> Optional[dict]:
+        """Run the event with group and name and return the API response (None on error or unknown event)."""
+        event = self.get_event(group, name)
+        if event is None:
+            _LOGGER.error(f"Unknown HomeSeer event on {self._host}: {group} {name}")
+            return None
+        return await event.run()
+
+    async def run_events(
+        self,
+        events: Iterable[Union[HomeSeerEvent, tuple]],
+        concurrency: int = EVENT_CONCURRENCY,
+    ) -> dict:
+        """
+        Run many events, with at most concurrency requests in flight at once.
+        events may contain HomeSeerEvent objects or (group, name) pairs.
+        Returns a dict of (group, name) -> API response, None (error or unknown event),
+        or the exception raised while running the event.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(key):
+            async with semaphore:
+                return await self.run_event(*key)
+
+        keys = [
+            event.key if isinstance(event, HomeSeerEvent) else tuple(event)
+            for event in events
+        ]
+        results = await asyncio.gather(
+            *(run(key) for key in keys), return_exceptions=True
+        )
+        return dict(zip(keys, results))
+
     async def start_listener(self) -> None:
         """Start the ASCII listener to listen for device changes."""
         await self._listener.start()
@@ -76,6 +378,75 @@ class HomeSeer:
     async def stop_listener(self) -> None:
         """Stop the ASCII listener."""
         await self._listener.stop()
+        for task in self._deferred_refreshes.values():
+            task.cancel()
+        self._deferred_refreshes.clear()
+
+    async def start_polling(
+        self,
+        fast_interval: float = POLL_FAST_TIMER,
+        slow_interval: float = POLL_SLOW_TIMER,
+        requests_per_second: float = POLL_REQUESTS_PER_SECOND,
+        priority_refs: Optional[Iterable[int]] = None,
+    ) -> None:
+        """
+        Start polling the JSON API for device changes (e.g. when the ASCII interface is disabled).
+        Recently changed devices and priority devices (priority_refs and add_poll_priority_ref)
+        are polled every fast_interval seconds, all other devices every slow_interval seconds,
+        using at most requests_per_second requests. Calling again restarts polling with the new parameters.
+        Polling does not change available, which only reflects the ASCII connection.
+        """
+        await self.stop_polling()
+        self._poll_priority_refs.update(priority_refs or ())
+        self._poller = Poller(
+            self._host,
+            async_poll_callback=self._poll_callback,
+            fast_interval=fast_interval,
+            slow_interval=slow_interval,
+            requests_per_second=requests_per_second,
+            priority_refs=self._poll_priority_refs,
+            metrics=self._metrics,
+        )
+        self._poller.set_refs(self.devices.keys())
+        await self._poller.start()
+
+    async def stop_polling(self) -> None:
+        """Stop polling the JSON API."""
+        if self._poller is not None:
+            await self._poller.stop()
+            self._poller = None
+
+    def add_poll_priority_ref(self, ref: int) -> None:
+        """Poll a device every fast_interval seconds regardless of activity (now or when polling starts)."""
+        self._poll_priority_refs.add(ref)
+        if self._poller is not None:
+            self._poller.add_priority_ref(ref)
+
+    def remove_poll_priority_ref(self, ref: int) -> None:
+        """Stop prioritizing a device added with priority_refs or add_poll_priority_ref."""
+        self._poll_priority_refs.discard(ref)
+        if self._poller is not None:
+            self._poller.remove_priority_ref(ref)
+
+    def register_message_callback(
+        self, callback: Callable, message_type: Optional[str] = None
+    ) -> None:
+        """
+        Register a callback for messages received by the ASCII listener.
+        The callback is called with the parsed message object (see .messages).
+        Set message_type (e.g. MESSAGE_EVENT) to only receive messages of that type;
+        leave it as None to receive all messages.
+        """
+        self._message_callbacks.setdefault(message_type, []).append(callback)
+
+    def unregister_message_callback(
+        self, callback: Callable, message_type: Optional[str] = None
+    ) -> None:
+        """Unregister a callback previously registered with register_message_callback."""
+        try:
+            self._message_callbacks[message_type].remove(callback)
+        except (KeyError, ValueError):
+            pass
 
     async def control_device_by_value(self, ref: int, value: int) -> None:
         """
@@ -91,6 +462,20 @@ class HomeSeer:
 
     async def _request(self, method, params=None, json=None) -> dict:
         """Make a request to the HomeSeer JSON API."""
+        if self._metrics is None:
+            return await self._send_request(method, params=params, json=json)
+
+        request = (params or json or {}).get("request") or (json or {}).get("action")
+        started = perf_counter()
+        try:
+            return await self._send_request(
+                method, params=params, json=json, request=request
+            )
+        finally:
+            self._request_duration.observe(perf_counter() - started, request=request)
+
+    async def _send_request(self, method, params=None, json=None, request=None) -> dict:
+        """Send a request to the HomeSeer JSON API and return the decoded response."""
         url = f"http://{self._host}:{self._http_port}/JSON"
 
         try:
@@ -114,9 +499,13 @@ class HomeSeer:
 
         except TimeoutError:
             _LOGGER.error(f"Timeout while requesting HomeSeer data from {self._host}")
+            if self._metrics is not None:
+                self._request_errors.inc(request=request)
 
         except Exception as ex:
             _LOGGER.error(f"HomeSeer HTTP Request error from {self._host}: {ex}")
+            if self._metrics is not None:
+                self._request_errors.inc(request=request)
 
     async def _get_devices(self) -> None:
         """Populate supported devices from HomeSeer API."""
@@ -130,18 +519,38 @@ class HomeSeer:
             params = {"request": "getcontrol"}
             result = await self._request("get", params=params)
 
-            control_data = result["Devices"]
+            controls = {item["ref"]: item for item in result["Devices"]}
 
+            indexed = set()
             for device in all_devices:
-                dev = get_device(device, control_data, self._request)
-                if dev is not None:
+                control = controls.get(device["ref"])
+                if self._lazy:
+                    self._devices.add(
+                        device, control["ControlPairs"] if control else None
+                    )
+                else:
+                    dev = get_device(
+                        device, [control] if control else [], self._request
+                    )
+                    if dev is None:
+                        continue
                     self._devices[dev.ref] = dev
+                self._index.add(device)
+                indexed.add(int(device["ref"]))
+
+            # Devices no longer reported by HomeSeer are dropped from the indexes
+            for ref in self._index.query() - indexed:
+                self._index.remove(ref)
+
+            if self._poller is not None:
+                # Poll devices found by a repeated discovery
+                self._poller.set_refs(self._devices.keys())
 
         except TypeError:
             _LOGGER.error(f"Error retrieving HomeSeer devices from {self._host}")
 
     async def _get_events(self) -> None:
-        """Populate supported events from HomeSeer API."""
+        """Populate (or incrementally refresh) supported events from HomeSeer API."""
         _LOGGER.debug(f"Requesting HomeSeer events from {self._host}")
         try:
             params = {"request": "getevents"}
@@ -149,43 +558,171 @@ class HomeSeer:
 
             all_events = result["Events"]
 
-            for event in all_events:
-                ev = HomeSeerEvent(event, self._request)
-                self._events.append(ev)
-
         except TypeError:
             _LOGGER.error(f"Error retrieving HomeSeer events from {self._host}")
+            return
 
-    async def _message_callback(self, device_ref: str) -> None:
-        """Called by the ASCII listener when a Device Change message is received."""
-        try:
-            device = self.devices[int(device_ref)]
-        except KeyError:
+        keys = set()
+        for event in all_events:
+            key = (event["Group"], event["Name"])
+            keys.add(key)
+            ev = self._event_index.get(key)
+            if ev is not None:
+                ev.update_data(event)
+            else:
+                ev = HomeSeerEvent(event, self._request)
+                self._event_index[key] = ev
+                self._events.append(ev)
+
+        if len(keys) != len(self._event_index):
+            self._events[:] = [ev for ev in self._events if ev.key in keys]
+            for key in list(self._event_index):
+                if key not in keys:
+                    del self._event_index[key]
+
+    async def _message_callback(self, message: HomeSeerASCIIMessage) -> None:
+        """Called by the ASCII listener when a message is received."""
+        # Malformed DC lines are plain HomeSeerASCIIMessage objects without a ref
+        if isinstance(
+            message, HomeSeerDeviceChangeMessage
+        ) and self._allow_device_change(message):
+            if self._pending_changes is not None:
+                # A refresh is in progress; buffer the change to replay after the refresh
+                self._pending_changes[message.ref] = message
+                if self._metrics is not None:
+                    self._pending_changes_depth.set(len(self._pending_changes))
+            else:
+                await self._device_change_callback(message.ref, message.trace)
+
+        for message_type in (message.message_type, None):
+            for callback in self._message_callbacks.get(message_type, ()):
+                try:
+                    callback(message)
+                except Exception as ex:
+                    _LOGGER.error(
+                        f"Error in ASCII message callback for {message} from {self._host}: {ex}"
+                    )
+
+    def _allow_device_change(self, message) -> bool:
+        """
+        Return True if a Device Change message passes the throttle policy of its device.
+        A throttled change schedules a deferred refresh of the device (one per device at a time).
+        """
+        if not self._throttle:
+            return True
+        raw_data = self._get_raw_data(message.ref)
+        if raw_data is None:
+            return True
+        device_type_string = raw_data["device_type_string"] or None
+        if self._throttle.allow(message.ref, device_type_string, message.new_value):
+            deferred = self._deferred_refreshes.pop(message.ref, None)
+            if deferred is not None:
+                deferred.cancel()
+            return True
+        _LOGGER.debug(f"Throttled Device Change message for device ref {message.ref}")
+        if self._metrics is not None:
+            self._throttled_changes.inc()
+        if message.ref not in self._deferred_refreshes:
+            delay = self._throttle.deferred_delay(message.ref, device_type_string)
+            self._deferred_refreshes[
+                message.ref
+            ] = asyncio.get_event_loop().create_task(
+                self._deferred_refresh(message.ref, delay)
+            )
+        return False
+
+    async def _deferred_refresh(self, device_ref: int, delay: float) -> None:
+        """Refresh a device after delay seconds, so that its last throttled change is not lost."""
+        await asyncio.sleep(delay)
+        self._deferred_refreshes.pop(device_ref, None)
+        if self._pending_changes is not None:
+            # A full refresh is in progress and includes the device
+            return
+        _LOGGER.debug(f"Deferred refresh of throttled device ref {device_ref}")
+        await self._device_change_callback(device_ref)
+        raw_data = self._get_raw_data(device_ref)
+        if raw_data is not None:
+            self._throttle.refreshed(device_ref, raw_data["value"])
+
+    async def _device_change_callback(
+        self, device_ref: int, trace: Optional[Trace] = None
+    ) -> None:
+        """Called when a Device Change message is received; refreshes the changed device."""
+        if device_ref not in self._devices:
             _LOGGER.debug(
                 f"Device Change message received for unsupported or uninitialized device "
                 f"from {self._host}: device ref {device_ref}"
             )
             return
 
-        params = {"request": "getstatus", "ref": device.ref}
+        params = {"request": "getstatus", "ref": device_ref}
         _LOGGER.debug(f"Requesting updated data for device ref {device_ref}")
         try:
+            if trace is not None:
+                trace.mark(STAGE_REFRESH_SENT)
             result = await self._request("get", params=params)
+            if trace is not None:
+                trace.mark(STAGE_REFRESH_RECEIVED)
             for raw_dev in result["Devices"]:
-                if int(raw_dev["ref"]) == device.ref:
-                    device.update_data(raw_dev)
+                if int(raw_dev["ref"]) == device_ref:
+                    self._apply_device_data(device_ref, raw_dev, trace=trace)
         except Exception as ex:
             _LOGGER.error(
-                f"Error retrieving updated data for device ref {device.ref} from {self._host}: {ex}"
+                f"Error retrieving updated data for device ref {device_ref} from {self._host}: {ex}"
             )
 
+    async def _poll_callback(self, refs: Optional[list]) -> list:
+        """
+        Called by the poller to request getstatus for a batch of device refs (or all devices if refs is None).
+        Updates devices whose data changed and returns their refs.
+        """
+        params = {"request": "getstatus"}
+        if refs is not None:
+            params["ref"] = ",".join(str(ref) for ref in refs)
+
+        try:
+            result = await self._request("get", params=params)
+            homeseer_devices = result["Devices"]
+        except TypeError:
+            _LOGGER.error(f"Error polling HomeSeer data from {self._host}")
+            return []
+
+        changed = []
+        for raw_device in homeseer_devices:
+            ref = int(raw_device["ref"])
+            raw_data = self._get_raw_data(ref)
+            if raw_data is None:
+                continue
+            if (
+                raw_device["value"] != raw_data["value"]
+                or raw_device["status"] != raw_data["status"]
+                or raw_device["last_change"] != raw_data["last_change"]
+            ):
+                self._apply_device_data(ref, raw_device)
+                changed.append(ref)
+        return changed
+
     async def _connect_callback(self) -> None:
-        """Called by the ASCII listener after an ASCII connection is established."""
+        """
+        Called by the ASCII listener after an ASCII connection is established.
+        Device Change messages received during the refresh are buffered and replayed afterwards.
+        """
         _LOGGER.debug(
             f"Refreshing devices for {self._host} and setting availability to True"
         )
         self._available = True
+        self._pending_changes = {}
 
+        try:
+            await self._refresh_devices()
+            await self._replay_pending_changes()
+        finally:
+            self._pending_changes = None
+            if self._metrics is not None:
+                self._pending_changes_depth.set(0)
+
+    async def _refresh_devices(self) -> None:
+        """Refresh the data of all devices from a single getstatus snapshot."""
         try:
             params = {"request": "getstatus"}
             result = await self._request("get", params=params)
@@ -196,19 +733,134 @@ class HomeSeer:
             return
 
         for raw_device in homeseer_devices:
-            try:
-                device = self.devices[int(raw_device["ref"])]
-                device.update_data(new_data=raw_device, connection_flag=True)
-            except KeyError:
+            ref = int(raw_device["ref"])
+            if ref in self._devices:
+                self._apply_device_data(ref, raw_device, connection_flag=True)
+            else:
                 _LOGGER.debug(
                     f"HomeSeer refresh data retrieved for unsupported or uninitialized device from {self._host}: "
                     f"device ref {raw_device['ref']} ({raw_device})"
                 )
 
+    async def _replay_pending_changes(self) -> None:
+        """
+        Replay Device Change messages buffered during a refresh.
+        Only devices whose refreshed value differs from the last buffered new value are refreshed again;
+        the others are already up to date in the snapshot.
+        """
+        while self._pending_changes:
+            device_ref, message = self._pending_changes.popitem()
+            raw_data = self._get_raw_data(device_ref)
+            if raw_data is None:
+                continue
+            if message.new_value is not None and raw_data["value"] == message.new_value:
+                continue
+            _LOGGER.debug(
+                f"Replaying Device Change received during refresh for device ref {device_ref}"
+            )
+            await self._device_change_callback(device_ref, message.trace)
+
     async def _disconnect_callback(self) -> None:
         """Called by the ASCII listener after an ASCII connection is disconnected."""
         _LOGGER.debug(f"Setting availability for {self._host} to False")
         self._available = False
 
-        for device in self.devices.values():
-            device.update_data(connection_flag=True)
+        # Devices not yet constructed in lazy mode have no update callbacks to notify
+        devices = self._devices.loaded() if self._lazy else self._devices.values()
+        for device in devices:
+            self._update_device(device, connection_flag=True)
+
+    def _get_raw_data(self, ref: int) -> Optional[dict]:
+        """Return the current raw data of a device without constructing it in lazy mode, or None if unknown."""
+        if self._lazy and not self._devices.is_loaded(ref):
+            return self._devices.get_raw(ref)
+        device = self._devices.get(ref)
+        return None if device is None else device._raw_data
+
+    def _apply_device_data(
+        self,
+        ref: int,
+        new_data: dict,
+        connection_flag: bool = False,
+        trace: Optional[Trace] = None,
+        record_changes: bool = True,
+    ) -> None:
+        """
+        Update a device with new data. In lazy mode, a device that has not been constructed
+        only has its stored raw data replaced (and the change indexed and recorded).
+        """
+        if not self._lazy or self._devices.is_loaded(ref):
+            self._update_device(
+                self._devices[ref],
+                new_data=new_data,
+                connection_flag=connection_flag,
+                trace=trace,
+                record_changes=record_changes,
+            )
+            return
+
+        raw_data = self._devices.get_raw(ref)
+        if raw_data is None:
+            return
+        record = record_changes and (
+            not connection_flag
+            or new_data["value"] != raw_data["value"]
+            or new_data["status"] != raw_data["status"]
+        )
+        self._devices.set_raw(ref, new_data)
+        self._index.add(new_data)
+        if record:
+            self._record_change(ref, new_data["value"], new_data["status"])
+        if trace is not None:
+            trace.mark(STAGE_UPDATED)
+            self._tracer.finish(trace)
+
+    def _update_device(
+        self,
+        device,
+        new_data: Optional[dict] = None,
+        connection_flag: bool = False,
+        trace: Optional[Trace] = None,
+        record_changes: bool = True,
+    ) -> None:
+        """
+        Update a device with new data (if any) and call its update callback.
+        With record_changes False, the change is not added to the history or the recorder.
+        """
+        record = (
+            record_changes
+            and new_data is not None
+            and (self._history is not None or self._recorder is not None)
+        )
+        if record and connection_flag:
+            # A connection refresh re-reports unchanged data; only record actual changes
+            record = (
+                new_data["value"] != device.value or new_data["status"] != device.status
+            )
+
+        if self._metrics is None:
+            device.update_data(new_data=new_data, connection_flag=connection_flag)
+        else:
+            started = perf_counter()
+            device.update_data(new_data=new_data, connection_flag=connection_flag)
+            self._update_duration.observe(perf_counter() - started)
+
+        if new_data is not None:
+            self._index.add(new_data)
+
+        if record:
+            self._record_change(device.ref, device.value, device.status)
+
+        if trace is not None:
+            trace.mark(STAGE_UPDATED)
+            self._tracer.finish(trace)
+
+    def _record_change(self, ref: int, value, status: str) -> None:
+        """Add a device change to the history and the recorder, if enabled."""
+        if self._history is None and self._recorder is None:
+            return
+        timestamp = time()
+        if self._history is not None:
+            self._history.record(ref, value, timestamp)
+        if self._recorder is not None:
+            self._recorder.record(ref, timestamp, value, status)
@@ -0,0 +1,110 @@
+"""Secondary indexes of HomeSeer devices for fast queries by device parameters."""
+
+from typing import Optional
+
+from .const import RELATIONSHIP_ROOT
+
+INDEX_DEVICE_TYPE_STRING = "device_type_string"
+INDEX_INTERFACE_NAME = "interface_name"
+INDEX_LOCATION = "location"
+INDEX_LOCATION2 = "location2"
+INDEX_RELATIONSHIP = "relationship"
+
+INDEX_FIELDS = (
+    INDEX_DEVICE_TYPE_STRING,
+    INDEX_INTERFACE_NAME,
+    INDEX_LOCATION,
+    INDEX_LOCATION2,
+    INDEX_RELATIONSHIP,
+)
+_RELATIONSHIP_POSITION = INDEX_FIELDS.index(INDEX_RELATIONSHIP)
+
+
+def _index_key(raw_data: dict, field: str):
+    """Return the index key of a field, normalized as the device properties return it."""
+    value = raw_data.get(field)
+    if field == INDEX_RELATIONSHIP:
+        return int(value) if value is not None else None
+    if field in (INDEX_DEVICE_TYPE_STRING, INDEX_INTERFACE_NAME) and not value:
+        return None
+    return value
+
+
+class DeviceIndex:
+    """
+    Maintains sets of device refs keyed by location, location2, device_type_string,
+    interface_name and relationship, and the child device refs of each root device.
+    Devices are indexed from their raw API data.
+    """
+
+    def __init__(self) -> None:
+        self._indexes = {field: {} for field in INDEX_FIELDS}
+        self._keys = {}
+        self._children = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, raw_data: dict) -> None:
+        """Index (or re-index) a device from its raw data."""
+        ref = int(raw_data["ref"])
+        keys = tuple(_index_key(raw_data, field) for field in INDEX_FIELDS)
+        if keys[_RELATIONSHIP_POSITION] == RELATIONSHIP_ROOT:
+            children = frozenset(
+                int(child) for child in raw_data.get("associated_devices") or ()
+            )
+        else:
+            children = None
+
+        if self._keys.get(ref) == keys and self._children.get(ref) == children:
+            return
+        self.remove(ref)
+
+        self._keys[ref] = keys
+        for field, key in zip(INDEX_FIELDS, keys):
+            self._indexes[field].setdefault(key, set()).add(ref)
+        if children is not None:
+            self._children[ref] = children
+
+    def remove(self, ref: int) -> None:
+        """Remove a device from the index."""
+        keys = self._keys.pop(ref, None)
+        if keys is None:
+            return
+        for field, key in zip(INDEX_FIELDS, keys):
+            refs = self._indexes[field][key]
+            refs.discard(ref)
+            if not refs:
+                del self._indexes[field][key]
+        self._children.pop(ref, None)
+
+    def query(self, **criteria) -> set:
+        """
+        Return the set of device refs matching all criteria,
+        given as field=value for the fields in INDEX_FIELDS.
+        """
+        matches = []
+        for field, value in criteria.items():
+            try:
+                refs = self._indexes[field].get(value)
+            except KeyError:
+                raise ValueError(f"Unsupported index field: {field}")
+            if not refs:
+                return set()
+            matches.append(refs)
+
+        if not matches:
+            return set(self._keys)
+        matches.sort(key=len)
+        return matches[0].intersection(*matches[1:])
+
+    def values(self, field: str) -> set:
+        """Return the distinct indexed values of a field (e.g. all locations)."""
+        try:
+            return set(self._indexes[field])
+        except KeyError:
+            raise ValueError(f"Unsupported index field: {field}")
+
+    def children(self, ref: int) -> Optional[frozenset]:
+        """Return the child device refs of a root device, or None if ref is not an indexed root device."""
+        return self._children.get(ref)
@@ -2,16 +2,37 @@
 
 import asyncio
 import logging
+import random
+import socket
+from time import perf_counter
+from typing import Optional
 
 from .const import DEFAULT_ASCII_PORT, DEFAULT_USERNAME, DEFAULT_PASSWORD
 from .errors import HomeSeerASCIIConnectionError
+from .messages import (
+    MESSAGE_DEVICE_CHANGE,
+    MESSAGE_EVENT,
+    MESSAGE_LOG,
+    MESSAGE_STRING_CHANGE,
+    HomeSeerDeviceChangeMessage,
+    get_message,
+)
 
+KEEPALIVE_COUNT = 3
+KEEPALIVE_IDLE = 30
+KEEPALIVE_INTERVAL = 10
 PING_TIMER = 60
+PING_TIMEOUT = 10
+RECONNECT_MAX_TIMER = 300
 RECONNECT_TIMER = 10
 STATE_CONNECTED = "connected"
 STATE_IDLE = "idle"
 STATE_STOPPED = "stopped"
 
+_METRIC_MESSAGE_TYPES = frozenset(
+    (MESSAGE_DEVICE_CHANGE, MESSAGE_EVENT, MESSAGE_LOG, MESSAGE_STRING_CHANGE)
+)
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -24,22 +45,68 @@ class Listener:
         self._async_message_callback = kwargs.get("async_message_callback")
         self._async_connect_callback = kwargs.get("async_connect_callback")
         self._async_disconnect_callback = kwargs.get("async_disconnect_callback")
+        self._ping_interval = kwargs.get("ping_interval", PING_TIMER)
+        self._ping_timeout = kwargs.get("ping_timeout", PING_TIMEOUT)
+        self._reconnect_timer = kwargs.get("reconnect_timer", RECONNECT_TIMER)
+        self._reconnect_max_timer = kwargs.get(
+            "reconnect_max_timer", RECONNECT_MAX_TIMER
+        )
+        self._tcp_keepalive = kwargs.get("tcp_keepalive", True)
+        self._keepalive_idle = kwargs.get("keepalive_idle", KEEPALIVE_IDLE)
+        self._keepalive_interval = kwargs.get("keepalive_interval", KEEPALIVE_INTERVAL)
+        self._keepalive_count = kwargs.get("keepalive_count", KEEPALIVE_COUNT)
         self._reader = None
         self._writer = None
         self._state = STATE_IDLE
         self._ping_task = None
-        self._ping_flag = False
+        self._last_received = 0.0
+        self._reconnect_attempts = 0
+        self._reconnect_count = 0
+        self._detection_latency = None
+        self._tracer = kwargs.get("tracer")
+        self._metrics = kwargs.get("metrics")
+        if self._metrics is not None:
+            self._messages_received = self._metrics.counter(
+                "ascii_messages",
+                "ASCII messages received, by message type (DC, EV, LG, SC or other).",
+            )
+            self._reconnects = self._metrics.counter(
+                "ascii_reconnects", "ASCII reconnection attempts."
+            )
+            self._detection_seconds = self._metrics.histogram(
+                "ascii_dead_connection_detection_seconds",
+                "Seconds between the last data received and detection of a dead ASCII connection.",
+                buckets=(1, 5, 10, 30, 60, 120, 300),
+            )
 
     @property
     def state(self):
         return self._state
 
+    @property
+    def reconnect_count(self) -> int:
+        """Return the number of reconnection attempts made since the listener was created."""
+        return self._reconnect_count
+
+    @property
+    def detection_latency(self) -> Optional[float]:
+        """
+        Return the number of seconds between the last data received and the detection
+        of the most recent dead connection by the ping deadline, or None if none has been detected.
+        """
+        return self._detection_latency
+
     async def start(self):
         """Start the ASCII listener."""
         self._state = STATE_IDLE
         if await self._open_connection():
             asyncio.get_event_loop().create_task(self._listen())
             self._ping_task = asyncio.get_event_loop().create_task(self._ping())
+
+            # Call the connect callback (if provided) only once messages are being read,
+            # so that device changes received while the callback runs are not missed
+            if self._async_connect_callback is not None:
+                await self._async_connect_callback()
         else:
             asyncio.get_event_loop().create_task(self._connect_handler())
 
@@ -52,10 +119,12 @@ class Listener:
         """Connect and login to HomeSeer ASCII at host:port."""
         # Attempt to connect to the ASCII connection at host:port
         try:
-            connection = await asyncio.open_connection(self._host, self._port)
-        except OSError as ex:
+            connection = await asyncio.wait_for(
+                asyncio.open_connection(self._host, self._port), self._ping_timeout
+            )
+        except (OSError, asyncio.TimeoutError) as ex:
             _LOGGER.error(
-                f"Error opening connection to HomeSeer ASCII at {self._host}:{self._port}: {ex}"
+                f"Error opening connection to HomeSeer ASCII at {self._host}:{self._port}: {ex!r}"
             )
             return False
         self._reader = connection[0]
@@ -63,6 +132,8 @@ class Listener:
         _LOGGER.info(
             f"Successful connection to HomeSeer ASCII at {self._host}:{self._port}"
         )
+        if self._tcp_keepalive:
+            self._set_keepalive()
 
         # Create auth message and write it to the ASCII connection
         auth = "au,{},{}\r\n".format(self._username, self._password).encode()
@@ -73,7 +144,10 @@ class Listener:
         await self._writer.drain()
 
         # Read response to auth message from the ASCII connection; expecting "ok"
-        msg = await self._reader.readline()
+        try:
+            msg = await asyncio.wait_for(self._reader.readline(), self._ping_timeout)
+        except asyncio.TimeoutError:
+            msg = b"timeout waiting for login response"
         if msg.decode().strip() == "ok":
             _LOGGER.debug(
                 f"Successful login to HomeSeer ASCII at {self._host}:{self._port}"
@@ -82,16 +156,15 @@ class Listener:
             _LOGGER.error(
                 f"Failed to login to HomeSeer ASCII at {self._host}:{self._port}: {msg.decode().strip()}"
             )
+            self._writer.close()
             return False
 
-        # We are connected and logged in, set the ping flag and set state to connected
-        self._ping_flag = True
+        # We are connected and logged in; reset the ping timer and backoff
+        # and set state to connected
+        self._last_received = asyncio.get_event_loop().time()
+        self._reconnect_attempts = 0
         self._state = STATE_CONNECTED
 
-        # If a connect callback has been provided, call it
-        if self._async_connect_callback is not None:
-            await self._async_connect_callback()
-
         return True
 
     async def _listen(self):
@@ -99,13 +172,15 @@ class Listener:
         try:
             while True:
                 msg = await self._reader.readline()
+                self._last_received = asyncio.get_event_loop().time()
+                received = perf_counter() if self._tracer is not None else None
                 _LOGGER.debug(
                     f"ASCII message received from {self._host}:{self._port}: {msg}"
                 )
                 if msg == b"":
                     raise HomeSeerASCIIConnectionError
                 else:
-                    await self._handle_message(msg.decode())
+                    await self._handle_message(msg.decode(), received)
 
         except HomeSeerASCIIConnectionError:
             _LOGGER.warning(f"ASCII connection to {self._host}:{self._port} closed")
@@ -117,53 +192,106 @@ class Listener:
             )
             await self._disconnect_handler()
 
-    async def _handle_message(self, raw):
+    async def _handle_message(self, raw, received=None):
         """Handle received messages from the ASCII connection."""
-        # Raw msg format is Type,Data; break the msg into its separate parts
-        msg = raw.split(",")
-        # Telnet connection is active so set the ping flag to reset the ping timer
-        self._ping_flag = True
-        # We only care about DC messages
-        if msg[0] == "DC":
-            # "DC" is a "Device Change" message with format "DC,ref,newval,oldval"
-            if self._async_message_callback is not None:
-                # Call the callback with (ref) to signal that the device has changed
-                await self._async_message_callback(msg[1])
-        else:
+        # Raw msg format is Type,Data; parse the msg into a typed message object
+        message = get_message(raw)
+        if self._tracer is not None and isinstance(
+            message, HomeSeerDeviceChangeMessage
+        ):
+            message.trace = self._tracer.start(message.ref, received)
+        if not message.message_type:
+            return
+        if self._metrics is not None:
+            # Label unknown types (e.g. the "vr" reply) with a fixed value
+            # to bound label cardinality
+            message_type = message.message_type
+            if message_type not in _METRIC_MESSAGE_TYPES:
+                message_type = "other"
+            self._messages_received.inc(type=message_type)
+        if self._async_message_callback is not None:
+            # Call the callback with the parsed message
+            # (e.g. "DC" signals that a device has changed)
+            await self._async_message_callback(message)
+
+    def _set_keepalive(self):
+        """Enable TCP keepalive on the ASCII connection socket (where supported by the platform)."""
+        sock = self._writer.get_extra_info("socket")
+        if sock is None:
+            return
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            for option, value in (
+                ("TCP_KEEPIDLE", self._keepalive_idle),
+                ("TCP_KEEPINTVL", self._keepalive_interval),
+                ("TCP_KEEPCNT", self._keepalive_count),
+            ):
+                if hasattr(socket, option):
+                    sock.setsockopt(socket.IPPROTO_TCP, getattr(socket, option), value)
+        except OSError as ex:
             _LOGGER.debug(
-                f"Unhandled ASCII message type received from {self._host}:{self._port}: {msg[0].strip()}"
+                f"Unable to set TCP keepalive for ASCII connection at {self._host}:{self._port}: {ex}"
             )
 
     async def _ping(self):
-        """Pings the ASCII connection to maintain connection."""
+        """
+        Pings the ASCII connection after ping_interval seconds without received data,
+        and closes the connection if no data is received within ping_timeout seconds.
+        """
+        loop = asyncio.get_event_loop()
         try:
             while True:
-                if self._ping_flag:
-                    _LOGGER.debug(
-                        f"Resetting ASCII ping timer for {self._host}:{self._port} to {PING_TIMER} seconds"
-                    )
-                    self._ping_flag = False
-                else:
-                    _LOGGER.debug(
-                        f"Pinging ASCII connection at {self._host}:{self._port}"
+                # Any received data resets the ping timer
+                idle = loop.time() - self._last_received
+                if idle < self._ping_interval:
+                    await asyncio.sleep(self._ping_interval - idle)
+                    continue
+
+                _LOGGER.debug(f"Pinging ASCII connection at {self._host}:{self._port}")
+                ping_sent = loop.time()
+                self._writer.write("vr\r\n".encode())
+                await self._writer.drain()
+                await asyncio.sleep(self._ping_timeout)
+
+                if self._last_received < ping_sent:
+                    self._detection_latency = loop.time() - self._last_received
+                    if self._metrics is not None:
+                        self._detection_seconds.observe(self._detection_latency)
+                    _LOGGER.warning(
+                        f"No response to ping from ASCII connection at {self._host}:{self._port} "
+                        f"within {self._ping_timeout} seconds; closing connection"
                     )
-                    self._writer.write("vr\r\n".encode())
-                    await self._writer.drain()
-                await asyncio.sleep(PING_TIMER)
+                    self._writer.transport.abort()
+                    return
         except asyncio.CancelledError:
             _LOGGER.debug(
-                f"Cancelling ping task for ASCII connection at {self._host}:{self._host}"
+                f"Cancelling ping task for ASCII connection at {self._host}:{self._port}"
             )
             raise
 
+    def _reconnect_delay(self) -> float:
+        """Return the next reconnect delay using exponential backoff with jitter."""
+        delay = min(
+            self._reconnect_max_timer,
+            self._reconnect_timer * 2 ** self._reconnect_attempts,
+        )
+        return random.uniform(delay / 2, delay)
+
     async def _connect_handler(self):
         """Called to attempt connect/reconnect after a delay."""
         if self.state != STATE_STOPPED:
+            delay = self._reconnect_delay()
+            self._reconnect_attempts += 1
+            self._reconnect_count += 1
+            if self._metrics is not None:
+                self._reconnects.inc()
             _LOGGER.info(
-                f"Attempting to connect ASCII listener to {self._host}:{self._port} in {RECONNECT_TIMER} seconds"
+                f"Attempting to connect ASCII listener to {self._host}:{self._port} in {delay:.1f} seconds"
             )
-            await asyncio.sleep(RECONNECT_TIMER)
-            await self.start()
+            await asyncio.sleep(delay)
+            # stop() may have been called during the delay
+            if self.state != STATE_STOPPED:
+                await self.start()
 
     async def _disconnect_handler(self):
         """Called after a disconnection or error from the ASCII listener."""
@@ -0,0 +1,156 @@
+"""Representations of HomeSeer ASCII interface messages as Python objects."""
+
+import logging
+from typing import Optional, Union
+
+MESSAGE_DEVICE_CHANGE = "DC"
+MESSAGE_EVENT = "EV"
+MESSAGE_LOG = "LG"
+MESSAGE_STRING_CHANGE = "SC"
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _parse_value(raw_value: str) -> Optional[Union[int, float]]:
+    """Parse a value field from an ASCII message, or return None if the field is not numeric."""
+    try:
+        if "." in raw_value:
+            return float(raw_value)
+        return int(raw_value)
+    except ValueError:
+        return None
+
+
+class HomeSeerASCIIMessage:
+    """
+    Representation of a message received from the HomeSeer ASCII interface.
+    Base representation for all other HomeSeer ASCII message objects.
+    """
+
+    # Set by the listener when tracing is enabled (see .tracing)
+    trace = None
+
+    def __init__(self, raw: str) -> None:
+        self._raw = raw.strip()
+        self._fields = self._raw.split(",")
+
+    @property
+    def message_type(self) -> str:
+        """Return the two-letter type of the message (e.g. "DC")."""
+        return self._fields[0]
+
+    @property
+    def fields(self) -> list:
+        """Return the comma-separated data fields of the message, excluding the message type."""
+        return self._fields[1:]
+
+    @property
+    def raw(self) -> str:
+        """Return the raw message as received from the ASCII interface."""
+        return self._raw
+
+    def _rest(self, index: int) -> str:
+        """Return all data fields from index onward, rejoined (free text may contain commas)."""
+        return ",".join(self.fields[index:])
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._raw!r})"
+
+
+class HomeSeerDeviceChangeMessage(HomeSeerASCIIMessage):
+    """Representation of a Device Change message with format "DC,ref,newval,oldval"."""
+
+    @property
+    def ref(self) -> int:
+        """Return the HomeSeer device ref of the changed device."""
+        return int(self.fields[0])
+
+    @property
+    def new_value(self) -> Optional[Union[int, float]]:
+        """Return the new value of the device, or None if it could not be parsed."""
+        return _parse_value(self.fields[1])
+
+    @property
+    def old_value(self) -> Optional[Union[int, float]]:
+        """Return the previous value of the device, or None if it could not be parsed."""
+        return _parse_value(self.fields[2])
+
+
+class HomeSeerStringChangeMessage(HomeSeerASCIIMessage):
+    """Representation of a device String Change message with format "SC,ref,string"."""
+
+    @property
+    def ref(self) -> int:
+        """Return the HomeSeer device ref of the changed device."""
+        return int(self.fields[0])
+
+    @property
+    def text(self) -> str:
+        """Return the new string (status text) of the device."""
+        return self._rest(1)
+
+
+class HomeSeerEventMessage(HomeSeerASCIIMessage):
+    """Representation of an Event message with format "EV,type,parameters"."""
+
+    @property
+    def event_type(self) -> str:
+        """Return the type of the event notification."""
+        return self.fields[0]
+
+    @property
+    def parameters(self) -> list:
+        """Return the parameters of the event notification."""
+        return self.fields[1:]
+
+
+class HomeSeerLogMessage(HomeSeerASCIIMessage):
+    """Representation of a Log message with format "LG,type,text"."""
+
+    @property
+    def log_type(self) -> str:
+        """Return the type (source) of the log entry."""
+        return self.fields[0]
+
+    @property
+    def text(self) -> str:
+        """Return the text of the log entry."""
+        return self._rest(1)
+
+
+_MESSAGE_CLASSES = {
+    MESSAGE_DEVICE_CHANGE: (HomeSeerDeviceChangeMessage, 3),
+    MESSAGE_EVENT: (HomeSeerEventMessage, 1),
+    MESSAGE_LOG: (HomeSeerLogMessage, 1),
+    MESSAGE_STRING_CHANGE: (HomeSeerStringChangeMessage, 1),
+}
+
+
+def get_message(raw: str) -> HomeSeerASCIIMessage:
+    """
+    Parses a raw ASCII line to return an appropriate message object
+    based on the message type.
+    DC = HomeSeerDeviceChangeMessage
+    SC = HomeSeerStringChangeMessage
+    EV = HomeSeerEventMessage
+    LG = HomeSeerLogMessage
+    other (or malformed) = HomeSeerASCIIMessage
+    """
+    message = HomeSeerASCIIMessage(raw)
+    try:
+        message_class, min_fields = _MESSAGE_CLASSES[message.message_type]
+    except KeyError:
+        return message
+
+    if len(message.fields) < min_fields:
+        _LOGGER.debug(f"Malformed ASCII message of type {message.message_type}: {raw}")
+        return message
+
+    if message_class in (HomeSeerDeviceChangeMessage, HomeSeerStringChangeMessage):
+        if not message.fields[0].strip().isdigit():
+            _LOGGER.debug(
+                f"Malformed ASCII message of type {message.message_type}: {raw}"
+            )
+            return message
+
+    return message_class(raw)
@@ -0,0 +1,206 @@
+"""Lightweight metrics (counters, gauges, histograms) with an OpenMetrics text exporter."""
+
+from bisect import bisect_left
+from typing import Optional, Sequence
+
+DEFAULT_LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+def _label_key(labels: dict) -> tuple:
+    """Return a hashable, ordered key for a set of labels."""
+    return tuple(sorted(labels.items())) if labels else ()
+
+
+def _format_labels(key: tuple, extra: Optional[tuple] = None) -> str:
+    """Format a label key (plus an optional extra label) in OpenMetrics syntax."""
+    items = key + (extra,) if extra is not None else key
+    if not items:
+        return ""
+    escaped = (
+        (
+            name,
+            str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+        )
+        for name, value in items
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value in OpenMetrics syntax."""
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class Counter:
+    """A monotonically increasing count, optionally split by labels."""
+
+    metric_type = "counter"
+
+    def __init__(self, name: str, description: str) -> None:
+        self.name = name
+        self.description = description
+        self._values = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        """Increase the counter by amount."""
+        key = _label_key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        """Return the current value of the counter."""
+        return self._values.get(_label_key(labels), 0)
+
+    def _samples(self) -> list:
+        return [
+            f"{self.name}_total{_format_labels(key)} {_format_value(value)}"
+            for key, value in self._values.items()
+        ]
+
+
+class Gauge:
+    """A value that can go up and down, optionally split by labels."""
+
+    metric_type = "gauge"
+
+    def __init__(self, name: str, description: str) -> None:
+        self.name = name
+        self.description = description
+        self._values = {}
+
+    def set(self, value: float, **labels) -> None:
+        """Set the gauge to value."""
+        self._values[_label_key(labels)] = value
+
+    def value(self, **labels) -> float:
+        """Return the current value of the gauge."""
+        return self._values.get(_label_key(labels), 0)
+
+    def _samples(self) -> list:
+        return [
+            f"{self.name}{_format_labels(key)} {_format_value(value)}"
+            for key, value in self._values.items()
+        ]
+
+
+class Histogram:
+    """A distribution of observed values in fixed buckets, optionally split by labels."""
+
+    metric_type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.description = description
+        self._buckets = tuple(sorted(buckets))
+        # label key -> [bucket counts..., +Inf count, sum]
+        self._values = {}
+
+    def observe(self, value: float, **labels) -> None:
+        """Record an observed value."""
+        key = _label_key(labels)
+        data = self._values.get(key)
+        if data is None:
+            data = self._values[key] = [0] * (len(self._buckets) + 2)
+        data[bisect_left(self._buckets, value)] += 1
+        data[-1] += value
+
+    def count(self, **labels) -> int:
+        """Return the number of observed values."""
+        data = self._values.get(_label_key(labels))
+        return sum(data[:-1]) if data is not None else 0
+
+    def sum(self, **labels) -> float:
+        """Return the sum of observed values."""
+        data = self._values.get(_label_key(labels))
+        return data[-1] if data is not None else 0
+
+    def _samples(self) -> list:
+        samples = []
+        for key, data in self._values.items():
+            cumulative = 0
+            for bound, count in zip(self._buckets + (float("inf"),), data[:-1]):
+                cumulative += count
+                samples.append(
+                    f"{self.name}_bucket{_format_labels(key, ('le', _format_value(bound)))} {cumulative}"
+                )
+            samples.append(f"{self.name}_count{_format_labels(key)} {cumulative}")
+            samples.append(
+                f"{self.name}_sum{_format_labels(key)} {_format_value(data[-1])}"
+            )
+        return samples
+
+
+class Metrics:
+    """
+    Registry of metrics for a HomeSeer instance.
+    Pass an instance to HomeSeer(metrics=...) to enable instrumentation;
+    without one, no metrics are recorded.
+    """
+
+    def __init__(self, prefix: str = "homeseer") -> None:
+        self._prefix = prefix
+        self._metrics = {}
+
+    def counter(self, name: str, description: str) -> Counter:
+        """Return the counter with name, creating it if necessary."""
+        return self._get(Counter, name, description)
+
+    def gauge(self, name: str, description: str) -> Gauge:
+        """Return the gauge with name, creating it if necessary."""
+        return self._get(Gauge, name, description)
+
+    def histogram(
+        self,
+        name: str,
+        description: str,
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        """Return the histogram with name, creating it if necessary."""
+        return self._get(Histogram, name, description, buckets)
+
+    def get(self, name: str):
+        """Return the metric with name (without prefix), or None if it does not exist."""
+        return self._metrics.get(f"{self._prefix}_{name}")
+
+    def render(self) -> str:
+        """Return all metrics in the OpenMetrics text exposition format."""
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# TYPE {metric.name} {metric.metric_type}")
+            lines.append(f"# HELP {metric.name} {metric.description}")
+            lines.extend(metric._samples())
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def _get(self, metric_class, name: str, description: str, *args):
+        full_name = f"{self._prefix}_{name}"
+        metric = self._metrics.get(full_name)
+        if metric is None:
+            metric = self._metrics[full_name] = metric_class(
+                full_name, description, *args
+            )
+        elif not isinstance(metric, metric_class):
+            raise ValueError(
+                f"Metric {full_name} already registered as a {metric.metric_type}"
+            )
+        return metric
@@ -0,0 +1,158 @@
+"""JSON polling fallback for HomeSeer installations without the ASCII interface."""
+
+import asyncio
+import logging
+from typing import Iterable
+
+POLL_ACTIVE_WINDOW = 300
+POLL_BATCH_SIZE = 50
+POLL_FAST_TIMER = 5
+POLL_REQUESTS_PER_SECOND = 2
+POLL_SLOW_TIMER = 60
+STATE_IDLE = "idle"
+STATE_POLLING = "polling"
+STATE_STOPPED = "stopped"
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class Poller:
+    """
+    Schedules getstatus requests for HomeSeer devices.
+    Priority devices (recently active, or explicitly subscribed) are polled every fast_interval seconds,
+    all other devices every slow_interval seconds. Due devices are requested in batches of batch_size refs,
+    and no more than requests_per_second requests are made.
+    """
+
+    def __init__(self, host, **kwargs):
+        self._host = host
+        self._async_poll_callback = kwargs.get("async_poll_callback")
+        self._fast_interval = kwargs.get("fast_interval", POLL_FAST_TIMER)
+        self._slow_interval = kwargs.get("slow_interval", POLL_SLOW_TIMER)
+        self._active_window = kwargs.get("active_window", POLL_ACTIVE_WINDOW)
+        self._batch_size = kwargs.get("batch_size", POLL_BATCH_SIZE)
+        self._requests_per_second = kwargs.get(
+            "requests_per_second", POLL_REQUESTS_PER_SECOND
+        )
+        self._priority_refs = set(kwargs.get("priority_refs") or ())
+        self._next_poll = {}
+        self._last_active = {}
+        self._state = STATE_IDLE
+        self._poll_task = None
+        self._metrics = kwargs.get("metrics")
+        if self._metrics is not None:
+            self._due_devices = self._metrics.gauge(
+                "poll_due_devices",
+                "Devices due to be polled in the current poll cycle.",
+            )
+
+    @property
+    def state(self):
+        return self._state
+
+    def set_refs(self, refs: Iterable[int]) -> None:
+        """Set the device refs to poll; new refs are polled on the next cycle."""
+        refs = set(refs)
+        for ref in list(self._next_poll):
+            if ref not in refs:
+                del self._next_poll[ref]
+                self._last_active.pop(ref, None)
+        for ref in refs:
+            self._next_poll.setdefault(ref, 0.0)
+
+    def add_priority_ref(self, ref: int) -> None:
+        """Poll the device every fast_interval seconds regardless of activity."""
+        self._priority_refs.add(ref)
+
+    def remove_priority_ref(self, ref: int) -> None:
+        """Stop prioritizing a device added with add_priority_ref."""
+        self._priority_refs.discard(ref)
+
+    async def start(self):
+        """Start polling."""
+        if self._poll_task is not None and not self._poll_task.done():
+            return
+        self._state = STATE_POLLING
+        self._poll_task = asyncio.get_event_loop().create_task(self._poll())
+
+    async def stop(self):
+        """Stop polling."""
+        self._state = STATE_STOPPED
+        if self._poll_task is not None:
+            self._poll_task.cancel()
+            self._poll_task = None
+
+    def _is_priority(self, ref: int, now: float) -> bool:
+        """Return True if the device should be polled every fast_interval seconds."""
+        if ref in self._priority_refs:
+            return True
+        return (
+            now - self._last_active.get(ref, -self._active_window) < self._active_window
+        )
+
+    async def _poll(self):
+        """Poll due devices until stopped, backing off after errors."""
+        loop = asyncio.get_event_loop()
+        errors = 0
+        try:
+            while True:
+                try:
+                    await self._poll_due()
+                    errors = 0
+                except Exception as ex:
+                    # Keep polling; nothing else reports changes without ASCII
+                    delay = min(self._slow_interval, self._fast_interval * 2 ** errors)
+                    errors += 1
+                    _LOGGER.error(
+                        f"HomeSeer poller error for {self._host}: {ex!r}; "
+                        f"retrying in {delay} seconds"
+                    )
+                    await asyncio.sleep(delay)
+                    continue
+
+                if self._next_poll:
+                    wait = min(self._next_poll.values()) - loop.time()
+                else:
+                    wait = self._fast_interval
+                await asyncio.sleep(min(max(wait, 0.0), self._fast_interval))
+
+        except asyncio.CancelledError:
+            _LOGGER.debug(f"Cancelling poll task for HomeSeer at {self._host}")
+            raise
+
+    async def _poll_due(self):
+        """Poll the devices that are due, within the request budget."""
+        loop = asyncio.get_event_loop()
+        min_request_time = 1 / self._requests_per_second
+        now = loop.time()
+        due = [ref for ref, next_poll in self._next_poll.items() if next_poll <= now]
+        # Priority devices first, so they are not delayed behind a large slow cycle
+        due.sort(key=lambda ref: not self._is_priority(ref, now))
+        if self._metrics is not None:
+            self._due_devices.set(len(due))
+
+        if due and len(due) * 2 >= len(self._next_poll):
+            # Most devices are due; one unfiltered getstatus is cheaper than batches
+            batches = [None]
+        else:
+            batches = [
+                due[i : i + self._batch_size]
+                for i in range(0, len(due), self._batch_size)
+            ]
+
+        for batch in batches:
+            started = loop.time()
+            changed = await self._async_poll_callback(batch)
+            now = loop.time()
+            for ref in changed or ():
+                self._last_active[ref] = now
+            for ref in due if batch is None else batch:
+                if ref in self._next_poll:
+                    interval = (
+                        self._fast_interval
+                        if self._is_priority(ref, now)
+                        else self._slow_interval
+                    )
+                    self._next_poll[ref] = now + interval
+            # Stay within the request budget
+            await asyncio.sleep(max(0.0, min_request_time - (now - started)))
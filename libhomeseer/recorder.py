@@ -0,0 +1,154 @@
+"""Append-only log of HomeSeer device changes, written in batches off the event loop."""
+
+import asyncio
+from itertools import islice
+import json
+import logging
+from typing import AsyncIterator, Iterator, Optional
+
+RECORDER_BATCH_SIZE = 500
+RECORDER_FLUSH_TIMER = 1.0
+RECORDER_READ_CHUNK_SIZE = 10000
+
+_LOGGER = logging.getLogger(__name__)
+
+_encode = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+
+
+class ChangeRecorder:
+    """
+    Writes device changes to a file, one compact JSON array per line:
+    [ref,timestamp,value,"status"] (timestamp as UNIX seconds).
+    Changes are buffered and written by the default executor every flush_interval seconds,
+    or as soon as batch_size changes are buffered.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        batch_size: int = RECORDER_BATCH_SIZE,
+        flush_interval: float = RECORDER_FLUSH_TIMER,
+    ) -> None:
+        self._path = path
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._buffer = []
+        self._file = None
+        self._flush_task = None
+        self._flush_lock = None
+        self._pending_flush = None
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    async def start(self) -> None:
+        """Open the log file for appending and start the periodic flush."""
+        loop = asyncio.get_event_loop()
+        self._file = await loop.run_in_executor(
+            None, lambda: open(self._path, "a", encoding="utf-8")
+        )
+        self._flush_lock = asyncio.Lock()
+        self._flush_task = loop.create_task(self._periodic_flush())
+
+    async def stop(self) -> None:
+        """Flush buffered changes and close the log file."""
+        # Wait for cancelled and pending flushes so that no write is in progress
+        # when the file is closed
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+            self._flush_task = None
+        if self._pending_flush is not None:
+            await asyncio.gather(self._pending_flush, return_exceptions=True)
+            self._pending_flush = None
+        if self._file is None:
+            return
+        await self.flush()
+        file, self._file = self._file, None
+        await asyncio.get_event_loop().run_in_executor(None, file.close)
+
+    def record(self, ref: int, timestamp: float, value, status: str) -> None:
+        """Buffer a device change to be written."""
+        self._buffer.append(_encode([ref, timestamp, value, status]))
+        if len(self._buffer) >= self._batch_size and (
+            self._pending_flush is None or self._pending_flush.done()
+        ):
+            self._pending_flush = asyncio.get_event_loop().create_task(self.flush())
+
+    async def flush(self) -> None:
+        """Write all buffered changes to the log file."""
+        async with self._flush_lock:
+            if not self._buffer or self._file is None:
+                return
+            lines, self._buffer = self._buffer, []
+            data = "\n".join(lines) + "\n"
+            write = asyncio.get_event_loop().run_in_executor(None, self._write, data)
+            try:
+                await asyncio.shield(write)
+            except asyncio.CancelledError:
+                # The write continues in the executor; hold the lock until it is done
+                # so that it cannot overlap the next write or the file being closed
+                await asyncio.wait({write})
+                self._log_write_error(write)
+                raise
+            except OSError:
+                self._log_write_error(write)
+
+    def _log_write_error(self, write: asyncio.Future) -> None:
+        ex = write.exception()
+        if ex is not None:
+            _LOGGER.error(f"Error writing device changes to {self._path}: {ex}")
+
+    def _write(self, data: str) -> None:
+        self._file.write(data)
+        self._file.flush()
+
+    async def _periodic_flush(self) -> None:
+        while True:
+            await asyncio.sleep(self._flush_interval)
+            await self.flush()
+
+
+def read_changes(path: str, until: Optional[float] = None) -> Iterator[tuple]:
+    """
+    Read a log written by ChangeRecorder and yield (ref, timestamp, value, status) tuples,
+    stopping at the first change after until (if given). Malformed lines (e.g. a partially written
+    last line) are skipped.
+    """
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            try:
+                ref, timestamp, value, status = json.loads(line)
+            except (TypeError, ValueError):
+                _LOGGER.debug(
+                    f"Skipping malformed line in device change log {path}: {line!r}"
+                )
+                continue
+            if until is not None and timestamp > until:
+                return
+            yield ref, timestamp, value, status
+
+
+async def read_change_chunks(
+    path: str,
+    until: Optional[float] = None,
+    chunk_size: int = RECORDER_READ_CHUNK_SIZE,
+) -> AsyncIterator[list]:
+    """
+    Read a log written by ChangeRecorder in the default executor and yield lists of
+    at most chunk_size (ref, timestamp, value, status) tuples, so that a large log
+    is never held in memory at once (see read_changes).
+    """
+    loop = asyncio.get_event_loop()
+    changes = read_changes(path, until)
+    try:
+        while True:
+            chunk = await loop.run_in_executor(
+                None, lambda: list(islice(changes, chunk_size))
+            )
+            if not chunk:
+                return
+            yield chunk
+    finally:
+        changes.close()
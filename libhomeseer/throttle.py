@@ -0,0 +1,148 @@
+"""Throttling of Device Change refreshes for high-frequency devices (e.g. power meters)."""
+
+from time import monotonic
+from typing import Optional, Union
+
+THROTTLE_TRAILING_TIMER = 30
+
+
+class ThrottlePolicy:
+    """
+    Conditions a Device Change message must meet to trigger a device refresh:
+    deadband - the new value differs from the last refreshed value by at least this much
+    min_interval - at least this many seconds have passed since the last refresh
+    sample_every - only every Nth Device Change message of the device is considered (starting with the first)
+    trailing_delay - a throttled change is refreshed anyway this many seconds after the last refresh,
+    once per burst, unless a later change passes the policy first; defaults to min_interval,
+    or THROTTLE_TRAILING_TIMER seconds if min_interval is 0
+    Changes that are throttled are not refreshed immediately, so the device keeps its last refreshed data
+    until a later change passes the policy or the deferred refresh is made.
+    """
+
+    def __init__(
+        self,
+        deadband: float = 0,
+        min_interval: float = 0,
+        sample_every: int = 1,
+        trailing_delay: Optional[float] = None,
+    ) -> None:
+        if (
+            deadband < 0
+            or min_interval < 0
+            or sample_every < 1
+            or (trailing_delay is not None and trailing_delay < 0)
+        ):
+            raise ValueError(
+                "deadband, min_interval and trailing_delay must be >= 0 and sample_every must be >= 1"
+            )
+        self.deadband = deadband
+        self.min_interval = min_interval
+        self.sample_every = sample_every
+        self.trailing_delay = trailing_delay
+
+    def __repr__(self) -> str:
+        return (
+            f"ThrottlePolicy(deadband={self.deadband}, min_interval={self.min_interval}, "
+            f"sample_every={self.sample_every}, trailing_delay={self.trailing_delay})"
+        )
+
+
+class Throttle:
+    """Applies ThrottlePolicy objects by device ref or by device_type_string (ref policies take precedence)."""
+
+    def __init__(self) -> None:
+        self._ref_policies = {}
+        self._type_policies = {}
+        # ref -> [last allowed value, last allowed time, messages seen]
+        self._state = {}
+
+    def __bool__(self) -> bool:
+        return bool(self._ref_policies or self._type_policies)
+
+    def set_policy(
+        self,
+        policy: Optional[ThrottlePolicy],
+        ref: Optional[int] = None,
+        device_type_string: Optional[str] = None,
+    ) -> None:
+        """Set (or with policy None, remove) the policy for a device ref or a device_type_string."""
+        if (ref is None) == (device_type_string is None):
+            raise ValueError("Exactly one of ref or device_type_string must be given")
+        policies, key = (
+            (self._ref_policies, ref)
+            if ref is not None
+            else (self._type_policies, device_type_string)
+        )
+        if policy is None:
+            policies.pop(key, None)
+        else:
+            policies[key] = policy
+
+    def get_policy(
+        self, ref: int, device_type_string: Optional[str] = None
+    ) -> Optional[ThrottlePolicy]:
+        """Return the policy applying to a device, or None if it is not throttled."""
+        policy = self._ref_policies.get(ref)
+        if policy is None and device_type_string is not None:
+            policy = self._type_policies.get(device_type_string)
+        return policy
+
+    def allow(
+        self,
+        ref: int,
+        device_type_string: Optional[str],
+        value: Optional[Union[int, float]],
+    ) -> bool:
+        """Return True if a Device Change message with value should trigger a refresh of the device."""
+        policy = self.get_policy(ref, device_type_string)
+        if policy is None:
+            return True
+
+        state = self._state.get(ref)
+        if state is None:
+            state = self._state[ref] = [None, None, 0]
+        count = state[2]
+        state[2] += 1
+        if count % policy.sample_every:
+            return False
+
+        now = monotonic()
+        last_value, last_time, _ = state
+        if last_time is not None and now - last_time < policy.min_interval:
+            return False
+        if (
+            policy.deadband
+            and value is not None
+            and last_value is not None
+            and abs(value - last_value) < policy.deadband
+        ):
+            return False
+
+        state[0] = value
+        state[1] = now
+        return True
+
+    def deferred_delay(
+        self, ref: int, device_type_string: Optional[str] = None
+    ) -> Optional[float]:
+        """
+        Return the seconds until a throttled change of a device should be refreshed anyway
+        (the trailing_delay of its policy after the last refresh), or None if the device is not throttled.
+        """
+        policy = self.get_policy(ref, device_type_string)
+        if policy is None:
+            return None
+        trailing_delay = policy.trailing_delay
+        if trailing_delay is None:
+            trailing_delay = policy.min_interval or THROTTLE_TRAILING_TIMER
+        state = self._state.get(ref)
+        if state is None or state[1] is None:
+            return trailing_delay
+        return max(0.0, state[1] + trailing_delay - monotonic())
+
+    def refreshed(self, ref: int, value: Optional[Union[int, float]]) -> None:
+        """Record a refresh of a device made outside allow() (e.g. a deferred refresh)."""
+        state = self._state.get(ref)
+        if state is not None:
+            state[0] = value
+            state[1] = monotonic()
@@ -0,0 +1,125 @@
+"""Optional latency tracing of ASCII Device Change messages through to device update callbacks."""
+
+from collections import deque
+import logging
+from time import perf_counter, time
+from typing import Callable, Iterable, Optional
+
+STAGE_RECEIVED = "received"
+STAGE_PARSED = "parsed"
+STAGE_REFRESH_SENT = "refresh_sent"
+STAGE_REFRESH_RECEIVED = "refresh_received"
+STAGE_UPDATED = "updated"
+
+TRACE_MAX_SAMPLES = 1000
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class Trace:
+    """
+    Timestamps of one Device Change message as it moves through libhomeseer:
+    received (line read from the ASCII socket) -> parsed (Listener._handle_message)
+    -> refresh_sent / refresh_received (getstatus request for the device) -> updated (update_data and callback).
+    """
+
+    def __init__(self, ref: int, received: float) -> None:
+        self.ref = ref
+        # Wall clock time of reception, for exporters that need absolute timestamps
+        self.start_time = time() - (perf_counter() - received)
+        self.stages = [(STAGE_RECEIVED, received)]
+
+    def mark(self, stage: str) -> None:
+        """Record the time at which stage was reached."""
+        self.stages.append((stage, perf_counter()))
+
+    @property
+    def total(self) -> float:
+        """Return the seconds from reception to the last recorded stage."""
+        return self.stages[-1][1] - self.stages[0][1]
+
+    def spans(self) -> list:
+        """
+        Return the trace as a list of (stage, start, end) spans, one per stage after reception,
+        with start and end as wall clock timestamps in seconds.
+        """
+        origin = self.stages[0][1]
+        spans = []
+        for (_, started), (stage, ended) in zip(self.stages, self.stages[1:]):
+            spans.append(
+                (
+                    stage,
+                    self.start_time + started - origin,
+                    self.start_time + ended - origin,
+                )
+            )
+        return spans
+
+    def __repr__(self) -> str:
+        stages = ", ".join(
+            f"{stage}={end - start:.6f}" for stage, start, end in self.spans()
+        )
+        return f"Trace(ref={self.ref}, total={self.total:.6f}, {stages})"
+
+
+class Tracer:
+    """
+    Collects traces of Device Change messages and reports stage latency percentiles.
+    Pass an instance to HomeSeer(tracer=...) to enable tracing; the most recent
+    max_samples completed traces are kept, and exporters registered with add_exporter
+    are called with each completed Trace.
+    """
+
+    def __init__(self, max_samples: int = TRACE_MAX_SAMPLES) -> None:
+        self._durations = {}
+        self._totals = deque(maxlen=max_samples)
+        self._max_samples = max_samples
+        self._exporters = []
+
+    def start(self, ref: int, received: float) -> Trace:
+        """Start a trace for a message received at the perf_counter time received."""
+        trace = Trace(ref, received)
+        trace.mark(STAGE_PARSED)
+        return trace
+
+    def finish(self, trace: Trace) -> None:
+        """Record a completed trace and pass it to the exporters."""
+        for stage, started, ended in trace.spans():
+            durations = self._durations.get(stage)
+            if durations is None:
+                durations = self._durations[stage] = deque(maxlen=self._max_samples)
+            durations.append(ended - started)
+        self._totals.append(trace.total)
+
+        for exporter in self._exporters:
+            try:
+                exporter(trace)
+            except Exception as ex:
+                _LOGGER.error(f"Error in trace exporter {exporter}: {ex}")
+
+    def add_exporter(self, exporter: Callable) -> None:
+        """Register a callable to be called with each completed Trace."""
+        self._exporters.append(exporter)
+
+    def remove_exporter(self, exporter: Callable) -> None:
+        """Unregister an exporter registered with add_exporter."""
+        try:
+            self._exporters.remove(exporter)
+        except ValueError:
+            pass
+
+    def percentiles(
+        self, stage: Optional[str] = None, percentiles: Iterable[float] = (50, 95, 99)
+    ) -> dict:
+        """
+        Return a dict of percentile -> seconds for the duration of stage
+        (the time from the previous stage), or for the total trace if stage is None.
+        Returns an empty dict if no traces have been recorded.
+        """
+        samples = sorted(
+            self._totals if stage is None else self._durations.get(stage, ())
+        )
+        if not samples:
+            return {}
+        last = len(samples) - 1
+        return {pct: samples[min(last, round(pct / 100 * last))] for pct in percentiles}